@@ -3,17 +3,26 @@
 Gitingest API使用示例
 
 本脚本演示如何使用Gitingest的REST API接口来摄入Git仓库。
-运行前请确保Gitingest服务器正在运行。
+运行前请确保Gitingest服务器正在运行。可选安装HTTP/2支持: pip install "httpx[http2]"，未安装时使用HTTP/1.1
 """
 
-import json
-import requests
-import time
-from typing import Dict, Any, Optional
+import asyncio
+from importlib.util import find_spec
+from statistics import median
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+# httpx的HTTP/2支持依赖可选的h2包，未安装时回退到HTTP/1.1
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# 服务端 /ingest 端点按客户端IP限速5次/分钟，所有示例共享这一额度
+RATE_LIMIT_WINDOW = 60  # 秒
 
 
 class GitingestAPIClient:
-    """Gitingest API客户端智能体"""
+    """Gitingest API异步客户端智能体"""
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         """
@@ -24,17 +33,36 @@ class GitingestAPIClient:
         """
         self.base_url = base_url.rstrip('/')
         self.api_base = f"{self.base_url}/api/v1"
+        
+        # 所有请求共享同一个连接池(HTTP keep-alive)；服务端支持时(HTTPS + ALPN)
+        # 并发请求会通过HTTP/2在同一个连接上多路复用
+        self._client = httpx.AsyncClient(
+            base_url=self.api_base,
+            http2=HTTP2_AVAILABLE,
+            timeout=120,  # 2分钟超时
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    
+    async def __aenter__(self) -> "GitingestAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
     
-    def health_check(self) -> Dict[str, Any]:
+    async def close(self) -> None:
+        """关闭客户端并释放连接池中的连接"""
+        await self._client.aclose()
+    
+    async def health_check(self) -> Dict[str, Any]:
         """检查API服务健康状态"""
         try:
-            response = requests.get(f"{self.api_base}/health", timeout=10)
+            response = await self._client.get("/health", timeout=10)
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e), "status": "unhealthy"}
     
-    def ingest_repository(
+    async def ingest_repository(
         self,
         source: str,
         max_file_size: Optional[int] = None,
@@ -50,21 +78,21 @@ class GitingestAPIClient:
             source: Git仓库URL或本地路径
             max_file_size: 最大文件大小(字节)
             include_patterns: 包含模式列表
-            exclude_patterns: 排除模式列表 
+            exclude_patterns: 排除模式列表
             branch: 指定分支
             method: HTTP方法 ("POST" 或 "GET")
-            
+        
         Returns:
             API响应的字典
         """
         if method.upper() == "POST":
-            return self._ingest_post(source, max_file_size, include_patterns, exclude_patterns, branch)
+            return await self._ingest_post(source, max_file_size, include_patterns, exclude_patterns, branch)
         else:
-            return self._ingest_get(source, max_file_size, include_patterns, exclude_patterns, branch)
+            return await self._ingest_get(source, max_file_size, include_patterns, exclude_patterns, branch)
     
-    def _ingest_post(self, source: str, max_file_size: Optional[int], 
-                     include_patterns: Optional[list], exclude_patterns: Optional[list],
-                     branch: Optional[str]) -> Dict[str, Any]:
+    async def _ingest_post(self, source: str, max_file_size: Optional[int],
+                           include_patterns: Optional[list], exclude_patterns: Optional[list],
+                           branch: Optional[str]) -> Dict[str, Any]:
         """使用POST方法摄入仓库"""
         data = {"source": source}
         
@@ -76,21 +104,17 @@ class GitingestAPIClient:
             data["exclude_patterns"] = exclude_patterns
         if branch:
             data["branch"] = branch
-            
+        
         try:
-            response = requests.post(
-                f"{self.api_base}/ingest",
-                json=data,
-                timeout=120  # 2分钟超时
-            )
+            response = await self._client.post("/ingest", json=data)
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return await self._fetch_content(response.json())
+        except httpx.HTTPError as e:
             return {"success": False, "error": str(e)}
     
-    def _ingest_get(self, source: str, max_file_size: Optional[int],
-                    include_patterns: Optional[list], exclude_patterns: Optional[list],
-                    branch: Optional[str]) -> Dict[str, Any]:
+    async def _ingest_get(self, source: str, max_file_size: Optional[int],
+                          include_patterns: Optional[list], exclude_patterns: Optional[list],
+                          branch: Optional[str]) -> Dict[str, Any]:
         """使用GET方法摄入仓库"""
         params = {"source": source}
         
@@ -102,85 +126,78 @@ class GitingestAPIClient:
             params["exclude_patterns"] = ",".join(exclude_patterns)
         if branch:
             params["branch"] = branch
-            
+        
         try:
-            response = requests.get(
-                f"{self.api_base}/ingest",
-                params=params,
-                timeout=120
-            )
+            response = await self._client.get("/ingest", params=params)
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return await self._fetch_content(response.json())
+        except httpx.HTTPError as e:
             return {"success": False, "error": str(e)}
     
-    def get_summary(self, source: str, branch: Optional[str] = None) -> Dict[str, Any]:
+    async def _fetch_content(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """内容较大时服务端只返回content_url，在此下载内容并填回content字段"""
+        data = result.get("data") or {}
+        content_url = data.get("content_url")
+        if content_url:
+            response = await self._client.get(f"{self.base_url}{content_url}")
+            response.raise_for_status()
+            data["content"] = response.text
+        return result
+    
+    async def get_summary(self, source: str, branch: Optional[str] = None) -> Dict[str, Any]:
         """
         获取仓库摘要信息(轻量级)
         
         Args:
             source: Git仓库URL或本地路径
             branch: 指定分支
-            
+        
         Returns:
             包含摘要信息的字典
         """
         params = {"source": source}
         if branch:
             params["branch"] = branch
-            
+        
         try:
-            response = requests.get(
-                f"{self.api_base}/ingest/summary",
-                params=params,
-                timeout=60
-            )
+            response = await self._client.get("/ingest/summary", params=params, timeout=60)
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
 
 
-def example_basic_usage():
+# 各示例并发执行，因此不直接打印，而是返回输出行，由main按顺序打印，避免输出交错
+
+async def example_basic_usage(client: GitingestAPIClient) -> List[str]:
     """基础使用示例"""
-    print("=== 基础使用示例 ===")
-    
-    client = GitingestAPIClient()
-    
-    # 健康检查
-    health = client.health_check()
-    print(f"健康状态: {health}")
-    
-    if health.get("status") != "healthy":
-        print("❌ API服务不可用，请检查服务器是否启动")
-        return
+    out = ["=== 基础使用示例 ==="]
     
     # 摄入一个小型示例仓库
-    print("\n正在摄入示例仓库...")
-    result = client.ingest_repository(
+    out.append("正在摄入示例仓库...")
+    result = await client.ingest_repository(
         source="https://github.com/octocat/Hello-World",
         include_patterns=["*.md", "*.txt"],
         max_file_size=1024 * 1024  # 1MB
     )
     
     if result.get("success"):
-        print("✅ 摄入成功！")
-        print(f"📊 摘要:\n{result['data']['summary']}")
-        print(f"\n🌳 目录结构:\n{result['data']['tree']}")
-        print(f"\n📄 内容长度: {len(result['data']['content'])} 字符")
+        out.append("✅ 摄入成功！")
+        out.append(f"📊 摘要:\n{result['data']['summary']}")
+        out.append(f"\n🌳 目录结构:\n{result['data']['tree']}")
+        out.append(f"\n📄 内容长度: {len(result['data']['content'])} 字符")
     else:
-        print(f"❌ 摄入失败: {result.get('error')}")
+        out.append(f"❌ 摄入失败: {result.get('error')}")
+    return out
 
 
-def example_advanced_usage():
+async def example_advanced_usage(client: GitingestAPIClient) -> List[str]:
     """高级使用示例"""
-    print("\n=== 高级使用示例 ===")
-    
-    client = GitingestAPIClient()
+    out = ["\n=== 高级使用示例 ==="]
     
     # 使用复杂的过滤模式
-    print("正在摄入Python项目的特定文件...")
-    result = client.ingest_repository(
+    out.append("正在摄入Python项目的特定文件...")
+    result = await client.ingest_repository(
         source="https://github.com/tiangolo/fastapi",
         include_patterns=["*.py", "*.md", "*.toml"],
         exclude_patterns=["**/tests/**", "**/test_*", "**/__pycache__/**"],
@@ -189,104 +206,150 @@ def example_advanced_usage():
     )
     
     if result.get("success"):
-        print("✅ 高级摄入成功！")
-        print(f"📊 摘要:\n{result['data']['summary']}")
+        out.append("✅ 高级摄入成功！")
+        out.append(f"📊 摘要:\n{result['data']['summary']}")
         
         # 分析结果
         metadata = result.get("metadata", {})
-        print(f"\n📋 元数据:")
+        out.append(f"\n📋 元数据:")
         for key, value in metadata.items():
-            print(f"  {key}: {value}")
+            out.append(f"  {key}: {value}")
     else:
-        print(f"❌ 摄入失败: {result.get('error')}")
+        out.append(f"❌ 摄入失败: {result.get('error')}")
+    return out
 
 
-def example_summary_only():
+async def example_summary_only(client: GitingestAPIClient) -> List[str]:
     """仅获取摘要的示例"""
-    print("\n=== 轻量级摘要示例 ===")
+    out = ["\n=== 轻量级摘要示例 ==="]
     
-    client = GitingestAPIClient()
-    
-    print("获取仓库摘要信息...")
-    summary = client.get_summary(
+    out.append("获取仓库摘要信息...")
+    summary = await client.get_summary(
         source="https://github.com/cyclotruc/gitingest",
         branch="main"
     )
     
     if "error" not in summary:
-        print("✅ 摘要获取成功！")
-        print(f"📊 仓库: {summary.get('repository')}")
-        print(f"🌿 分支: {summary.get('branch')}")
-        print(f"📄 摘要:\n{summary.get('summary')}")
+        out.append("✅ 摘要获取成功！")
+        out.append(f"📊 仓库: {summary.get('repository')}")
+        out.append(f"🌿 分支: {summary.get('branch')}")
+        out.append(f"📄 摘要:\n{summary.get('summary')}")
     else:
-        print(f"❌ 获取摘要失败: {summary.get('error')}")
+        out.append(f"❌ 获取摘要失败: {summary.get('error')}")
+    return out
 
 
-def example_error_handling():
+async def example_error_handling(client: GitingestAPIClient) -> List[str]:
     """错误处理示例"""
-    print("\n=== 错误处理示例 ===")
+    out = ["\n=== 错误处理示例 ==="]
+    
+    # 同时测试无效URL和不存在的仓库
+    invalid_result, missing_result = await asyncio.gather(
+        client.ingest_repository(source="invalid-url"),
+        client.ingest_repository(source="https://github.com/nonexistent/repo"),
+    )
     
-    client = GitingestAPIClient()
+    out.append("测试无效仓库URL...")
+    if not invalid_result.get("success"):
+        out.append(f"✅ 正确捕获错误: {invalid_result.get('error')}")
     
-    # 测试无效URL
-    print("测试无效仓库URL...")
-    result = client.ingest_repository(source="invalid-url")
+    out.append("\n测试不存在的仓库...")
+    if not missing_result.get("success"):
+        out.append(f"✅ 正确处理不存在的仓库: {missing_result.get('error')}")
+    return out
+
+
+async def _bench(request: Callable[[], Awaitable[Dict[str, Any]]], runs: int) -> Tuple[List[int], Dict[str, Any]]:
+    """
+    热身一次后重复执行请求，记录每次成功请求的耗时
     
-    if not result.get("success"):
-        print(f"✅ 正确捕获错误: {result.get('error')}")
+    Args:
+        request: 发送一次请求的协程函数
+        runs: 计时的次数
     
-    # 测试不存在的仓库
-    print("\n测试不存在的仓库...")
-    result = client.ingest_repository(source="https://github.com/nonexistent/repo")
+    Returns:
+        每次成功请求的耗时(纳秒)列表，以及最后一次请求的结果
+    """
+    # 热身：首次请求包含克隆和摄入，之后的请求命中服务端缓存
+    result = await request()
     
-    if not result.get("success"):
-        print(f"✅ 正确处理不存在的仓库: {result.get('error')}")
+    samples = []
+    for _ in range(runs):
+        start = perf_counter_ns()
+        result = await request()
+        elapsed = perf_counter_ns() - start
+        if not result.get("success"):
+            # 失败的请求(例如被限速)耗时没有参考意义，停止计时
+            break
+        samples.append(elapsed)
+    return samples, result
 
 
-def example_get_vs_post():
-    """对比GET和POST方法"""
-    print("\n=== GET vs POST方法对比 ===")
+async def example_get_vs_post(client: GitingestAPIClient, runs: int = 4) -> List[str]:
+    """
+    对比GET和POST方法
     
-    client = GitingestAPIClient()
+    服务端对每个端点限速5次/分钟(含热身请求)，因此默认只计时4次；该额度与其他示例共享，
+    所以main在其他示例结束并等待一个限速窗口后才单独运行本示例；结果取中位数，不受个别慢请求(如GC暂停)的影响
+    """
+    out = ["\n=== GET vs POST方法对比 ==="]
     
     source = "https://github.com/octocat/Hello-World"
     
     # 使用POST方法
-    print("使用POST方法...")
-    start_time = time.time()
-    post_result = client.ingest_repository(source=source, method="POST")
-    post_time = time.time() - start_time
+    out.append("使用POST方法...")
+    post_samples, post_result = await _bench(lambda: client.ingest_repository(source=source, method="POST"), runs)
     
-    # 使用GET方法  
-    print("使用GET方法...")
-    start_time = time.time()
-    get_result = client.ingest_repository(source=source, method="GET")
-    get_time = time.time() - start_time
+    # 使用GET方法
+    out.append("使用GET方法...")
+    get_samples, get_result = await _bench(lambda: client.ingest_repository(source=source, method="GET"), runs)
     
-    print(f"POST方法耗时: {post_time:.2f}秒")
-    print(f"GET方法耗时: {get_time:.2f}秒")
+    for name, samples in (("POST", post_samples), ("GET", get_samples)):
+        if samples:
+            out.append(f"{name}方法耗时中位数: {median(samples) / 1e6:.2f}毫秒 ({len(samples)}次)")
+        else:
+            out.append(f"{name}方法没有成功的计时结果")
     
     if post_result.get("success") and get_result.get("success"):
-        print("✅ 两种方法都成功返回结果")
+        out.append("✅ 两种方法都成功返回结果")
     else:
-        print("❌ 某种方法失败")
+        out.append("❌ 某种方法失败")
+    return out
 
 
-def main():
+async def main():
     """主函数"""
     print("🚀 Gitingest API 使用示例")
     print("=" * 50)
     
     try:
-        example_basic_usage()
-        example_advanced_usage()
-        example_summary_only()
-        example_error_handling()
-        example_get_vs_post()
+        # 所有示例共享同一个客户端，从而复用同一个连接池
+        async with GitingestAPIClient() as client:
+            health = await client.health_check()
+            print(f"健康状态: {health}")
+            
+            if health.get("status") != "healthy":
+                print("❌ API服务不可用，请检查服务器是否启动")
+                return
+            
+            # 并发执行其余示例，总耗时约等于最慢的一个示例
+            outputs = await asyncio.gather(
+                example_basic_usage(client),
+                example_advanced_usage(client),
+                example_summary_only(client),
+                example_error_handling(client),
+            )
+            for lines in outputs:
+                print("\n".join(lines))
+            
+            # 上面的示例已用掉大部分POST /ingest额度，等限速窗口重置后再计时，避免基准测试被限速
+            print(f"\n等待{RATE_LIMIT_WINDOW}秒，让限速额度重置后再进行GET vs POST对比...")
+            await asyncio.sleep(RATE_LIMIT_WINDOW)
+            print("\n".join(await example_get_vs_post(client)))
         
         print("\n" + "=" * 50)
         print("✅ 所有示例执行完成！")
-        
+    
     except KeyboardInterrupt:
         print("\n❌ 用户中断执行")
     except Exception as e:
@@ -294,4 +357,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,6 +1,11 @@
 """This module contains functions for cloning a Git repository to a local path."""
 
+import asyncio
 import os
+import shutil
+import time
+import uuid
+import weakref
 from pathlib import Path
 from typing import Optional
 
@@ -10,6 +15,13 @@ from gitingest.utils.timeout_wrapper import async_timeout
 
 TIMEOUT: int = 60
 
+# One lock per mirror, so concurrent fetches never race on the mirror's shallow file. Entries disappear once no
+# coroutine holds the lock any more.
+_MIRROR_LOCKS: "weakref.WeakValueDictionary[Path, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# File inside each mirror whose modification time records when the mirror was last used
+_MIRROR_LAST_USED = "gitingest-last-used"
+
 
 @async_timeout(TIMEOUT)
 async def clone_repo(config: CloneConfig) -> None:
@@ -53,8 +65,15 @@ async def clone_repo(config: CloneConfig) -> None:
     clone_cmd = ["git", "clone", "--single-branch"]
     # TODO re-enable --recurse-submodules
 
+    if partial_clone or commit:
+        # Skip blobs up front; git fetches only those needed by the tree that is finally checked out
+        clone_cmd += ["--filter=blob:none"]
+
     if partial_clone:
-        clone_cmd += ["--filter=blob:none", "--sparse"]
+        clone_cmd += ["--sparse"]
+    elif commit:
+        # Avoid checking out (and downloading the blobs of) the branch tip before switching to the commit
+        clone_cmd += ["--no-checkout"]
 
     if not commit:
         clone_cmd += ["--depth=1"]
@@ -83,3 +102,156 @@ async def clone_repo(config: CloneConfig) -> None:
 
         # Check out the specific commit and/or subpath
         await run_command(*checkout_cmd)
+
+
+@async_timeout(TIMEOUT)
+async def checkout_from_mirror(config: CloneConfig, mirror_path: Path) -> None:
+    """
+    Check out a repository into a local path using a persistent bare mirror.
+
+    The mirror is created on first use. Each call fetches only the requested commit, branch or the default branch
+    (shallow and without blobs) into the mirror, then adds a detached worktree for it at `config.local_path`.
+    When `config.commit` is set, exactly that commit is checked out, even if a branch has moved on since it was
+    resolved.
+    Objects already present in the mirror from earlier calls are not downloaded again, and the blobs of the checked
+    out tree are fetched on demand. The worktree should be removed with `remove_mirror_worktree` once it is no
+    longer needed.
+
+    Parameters
+    ----------
+    config : CloneConfig
+        The configuration for cloning the repository.
+    mirror_path : Path
+        The path of the bare mirror to use for this repository.
+
+    Raises
+    ------
+    ValueError
+        If the repository is not found or if the provided URL is invalid.
+    OSError
+        If an error occurs while creating the parent directory for the repository.
+    """
+    parent_dir = Path(config.local_path).parent
+    try:
+        os.makedirs(parent_dir, exist_ok=True)
+    except OSError as exc:
+        raise OSError(f"Failed to create parent directory {parent_dir}: {exc}") from exc
+
+    if not await check_repo_exists(config.url):
+        raise ValueError("Repository not found, make sure it is public")
+
+    await ensure_git_installed()
+
+    mirror = str(mirror_path)
+    lock = _MIRROR_LOCKS.setdefault(mirror_path, asyncio.Lock())
+
+    async with lock:
+        if not mirror_path.exists():
+            await _create_mirror(config.url, mirror_path)
+
+        if config.commit:
+            await run_command("git", "-C", mirror, "fetch", "--depth=1", "--filter=blob:none", "origin", config.commit)
+            await run_command("git", "-C", mirror, "worktree", "add", "--detach", config.local_path, config.commit)
+        else:
+            # Fetch into a ref private to this call rather than FETCH_HEAD, which other processes may overwrite
+            ref = config.branch or "HEAD"
+            local_ref = f"refs/gitingest/{uuid.uuid4().hex}"
+            await run_command(
+                "git", "-C", mirror, "fetch", "--depth=1", "--filter=blob:none", "origin", f"+{ref}:{local_ref}"
+            )
+            try:
+                await run_command("git", "-C", mirror, "worktree", "add", "--detach", config.local_path, local_ref)
+            finally:
+                await run_command("git", "-C", mirror, "update-ref", "-d", local_ref)
+
+        # Record the last use, so idle mirrors can be pruned
+        (mirror_path / _MIRROR_LAST_USED).touch()
+
+
+async def _create_mirror(url: str, mirror_path: Path) -> None:
+    """
+    Create an empty bare mirror of a repository.
+
+    The mirror is set up in a temporary directory and renamed into place, so an interrupted setup (e.g. a timeout)
+    never leaves a mirror without its `origin` remote behind.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the repository.
+    mirror_path : Path
+        The path of the bare mirror to create.
+    """
+    tmp_path = mirror_path.with_name(f"{mirror_path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        await run_command("git", "init", "--bare", str(tmp_path))
+        await run_command("git", "-C", str(tmp_path), "remote", "add", "origin", url)
+        try:
+            tmp_path.rename(mirror_path)
+        except OSError:
+            # Another process created the mirror first; use theirs
+            if not mirror_path.exists():
+                raise
+    finally:
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+async def remove_mirror_worktree(local_path: str, mirror_path: Path) -> None:
+    """
+    Remove a worktree created by `checkout_from_mirror`.
+
+    Parameters
+    ----------
+    local_path : str
+        The path of the worktree to remove.
+    mirror_path : Path
+        The path of the bare mirror the worktree belongs to.
+    """
+    await run_command("git", "-C", str(mirror_path), "worktree", "remove", "--force", local_path)
+
+
+async def prune_mirrors(mirrors_dir: Path, max_idle: int) -> None:
+    """
+    Clean up the bare mirrors created by `checkout_from_mirror`.
+
+    Stale worktree metadata (e.g. of worktrees whose directory was deleted) is pruned from every mirror. Mirrors
+    unused for more than `max_idle` seconds and without live worktrees are deleted, which also drops the blobs
+    fetched into them on demand; a later request simply creates the mirror again. The remaining mirrors are
+    garbage-collected with `git gc --auto`.
+
+    Parameters
+    ----------
+    mirrors_dir : Path
+        The directory containing the mirrors.
+    max_idle : int
+        The number of seconds after which an unused mirror is deleted.
+    """
+    if not mirrors_dir.exists():
+        return
+
+    loop = asyncio.get_running_loop()
+    for mirror_path in mirrors_dir.iterdir():
+        if mirror_path.suffix == ".tmp":
+            # Left behind by a process that died while creating a mirror
+            if time.time() - mirror_path.stat().st_mtime > max_idle:
+                await loop.run_in_executor(None, shutil.rmtree, mirror_path, True)
+            continue
+
+        lock = _MIRROR_LOCKS.setdefault(mirror_path, asyncio.Lock())
+        async with lock:
+            mirror = str(mirror_path)
+            try:
+                last_used = mirror_path / _MIRROR_LAST_USED
+                idle = time.time() - (last_used if last_used.exists() else mirror_path).stat().st_mtime > max_idle
+
+                await run_command("git", "-C", mirror, "worktree", "prune")
+                worktrees_dir = mirror_path / "worktrees"
+                in_use = worktrees_dir.exists() and any(worktrees_dir.iterdir())
+                if idle and not in_use:
+                    await loop.run_in_executor(None, shutil.rmtree, mirror_path)
+                else:
+                    await run_command("git", "-C", mirror, "gc", "--auto", "--quiet")
+            except (OSError, RuntimeError) as exc:
+                print(f"Error pruning mirror {mirror_path}: {exc}")
@@ -16,7 +16,7 @@ except ImportError:
     import tomli as tomllib
 
 
-def ingest_query(query: IngestionQuery) -> Tuple[str, str, str]:
+def ingest_query(query: IngestionQuery, *, summary_only: bool = False) -> Tuple[str, str, str]:
     """
     Run the ingestion process for a parsed query.
 
@@ -28,6 +28,9 @@ def ingest_query(query: IngestionQuery) -> Tuple[str, str, str]:
     ----------
     query : IngestionQuery
         The parsed query object containing information about the repository and query parameters.
+    summary_only : bool
+        If True, only the summary is generated: file contents are not read, the directory structure and contents are
+        returned as empty strings and the summary has no token estimation (default is False).
 
     Returns
     -------
@@ -66,7 +69,7 @@ def ingest_query(query: IngestionQuery) -> Tuple[str, str, str]:
         if not file_node.content:
             raise ValueError(f"File {file_node.name} has no content")
 
-        return format_node(file_node, query)
+        return format_node(file_node, query, summary_only=summary_only)
 
     root_node = FileSystemNode(
         name=path.name,
@@ -83,7 +86,7 @@ def ingest_query(query: IngestionQuery) -> Tuple[str, str, str]:
         stats=stats,
     )
 
-    return format_node(root_node, query)
+    return format_node(root_node, query, summary_only=summary_only)
 
 
 def apply_gitingest_file(path: Path, query: IngestionQuery) -> None:
@@ -1,14 +1,17 @@
 """Functions to ingest and analyze a codebase directory or single file."""
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import tiktoken
 
 from gitingest.query_parsing import IngestionQuery
 from gitingest.schemas import FileSystemNode, FileSystemNodeType
 
+# Average number of bytes per cl100k_base token in source code and prose, used when file contents are not read
+BYTES_PER_TOKEN = 4
 
-def format_node(node: FileSystemNode, query: IngestionQuery) -> Tuple[str, str, str]:
+
+def format_node(node: FileSystemNode, query: IngestionQuery, summary_only: bool = False) -> Tuple[str, str, str]:
     """
     Generate a summary, directory structure, and file contents for a given file system node.
 
@@ -20,6 +23,9 @@ def format_node(node: FileSystemNode, query: IngestionQuery) -> Tuple[str, str,
         The file system node to be summarized.
     query : IngestionQuery
         The parsed query object containing information about the repository and query parameters.
+    summary_only : bool
+        If True, skip building the directory structure and file contents (returned as empty strings) and estimate
+        the tokens from the file sizes instead of tokenizing the contents (default is False).
 
     Returns
     -------
@@ -35,8 +41,11 @@ def format_node(node: FileSystemNode, query: IngestionQuery) -> Tuple[str, str,
         summary += f"File: {node.name}\n"
         summary += f"Lines: {len(node.content.splitlines()):,}\n"
 
+    if summary_only:
+        summary += f"\nEstimated tokens: {_format_count(node.size // BYTES_PER_TOKEN)}"
+        return summary, "", ""
+
     tree = "Directory structure:\n" + _create_tree_structure(query, node)
-    _create_tree_structure(query, node)
 
     content = _gather_file_contents(node)
 
@@ -90,6 +99,8 @@ def _gather_file_contents(node: FileSystemNode) -> str:
 
     This function recursively processes a directory node and gathers the contents of all files
     under that node. It returns the concatenated content of all files as a single string.
+    The contents are collected into a flat list and joined once, so each file's content is copied
+    a single time regardless of how deeply it is nested.
 
     Parameters
     ----------
@@ -101,11 +112,33 @@ def _gather_file_contents(node: FileSystemNode) -> str:
     str
         The concatenated content of all files under the given node.
     """
+    contents: List[str] = []
+    _collect_file_contents(node, contents)
+    return "\n".join(contents)
+
+
+def _collect_file_contents(node: FileSystemNode, contents: List[str]) -> None:
+    """
+    Recursively append the contents of all files under the given node to a list.
+
+    Parameters
+    ----------
+    node : FileSystemNode
+        The current directory or file node being processed.
+    contents : List[str]
+        The list the file contents are appended to.
+    """
     if node.type != FileSystemNodeType.DIRECTORY:
-        return node.content_string
+        contents.append(node.content_string)
+        return
+
+    if not node.children:
+        # An empty directory still contributes an (empty) entry to the joined output
+        contents.append("")
+        return
 
-    # Recursively gather contents of all files under the current directory
-    return "\n".join(_gather_file_contents(child) for child in node.children)
+    for child in node.children:
+        _collect_file_contents(child, contents)
 
 
 def _create_tree_structure(query: IngestionQuery, node: FileSystemNode, prefix: str = "", is_last: bool = True) -> str:
@@ -131,11 +164,38 @@ def _create_tree_structure(query: IngestionQuery, node: FileSystemNode, prefix:
     str
         A string representing the directory structure formatted as a tree.
     """
+    lines: List[str] = []
+    _append_tree_lines(query, node, lines, prefix=prefix, is_last=is_last)
+    return "".join(lines)
+
+
+def _append_tree_lines(
+    query: IngestionQuery,
+    node: FileSystemNode,
+    lines: List[str],
+    prefix: str,
+    is_last: bool,
+) -> None:
+    """
+    Recursively append the tree lines of the given node and its children to a list.
+
+    Parameters
+    ----------
+    query : IngestionQuery
+        The parsed query object containing information about the repository and query parameters.
+    node : FileSystemNode
+        The current directory or file node being processed.
+    lines : List[str]
+        The list the tree lines are appended to.
+    prefix : str
+        A string used for indentation and formatting of the tree structure.
+    is_last : bool
+        A flag indicating whether the current node is the last in its directory.
+    """
     if not node.name:
         # If no name is present, use the slug as the top-level directory name
         node.name = query.slug
 
-    tree_str = ""
     current_prefix = "└── " if is_last else "├── "
 
     # Indicate directories with a trailing slash
@@ -145,13 +205,12 @@ def _create_tree_structure(query: IngestionQuery, node: FileSystemNode, prefix:
     elif node.type == FileSystemNodeType.SYMLINK:
         display_name += " -> " + node.path.readlink().name
 
-    tree_str += f"{prefix}{current_prefix}{display_name}\n"
+    lines.append(f"{prefix}{current_prefix}{display_name}\n")
 
     if node.type == FileSystemNodeType.DIRECTORY and node.children:
         prefix += "    " if is_last else "│   "
         for i, child in enumerate(node.children):
-            tree_str += _create_tree_structure(query, node=child, prefix=prefix, is_last=i == len(node.children) - 1)
-    return tree_str
+            _append_tree_lines(query, child, lines, prefix=prefix, is_last=i == len(node.children) - 1)
 
 
 def _format_token_count(text: str) -> Optional[str]:
@@ -177,10 +236,29 @@ def _format_token_count(text: str) -> Optional[str]:
         print(exc)
         return None
 
-    if total_tokens >= 1_000_000:
-        return f"{total_tokens / 1_000_000:.1f}M"
+    return _format_count(total_tokens)
+
+
+def _format_count(count: int) -> str:
+    """
+    Return a human-readable string representing a token count.
+
+    E.g., 120 -> '120', 1200 -> '1.2k', 1200000 -> '1.2M'.
+
+    Parameters
+    ----------
+    count : int
+        The number of tokens.
+
+    Returns
+    -------
+    str
+        The formatted number of tokens.
+    """
+    if count >= 1_000_000:
+        return f"{count / 1_000_000:.1f}M"
 
-    if total_tokens >= 1_000:
-        return f"{total_tokens / 1_000:.1f}k"
+    if count >= 1_000:
+        return f"{count / 1_000:.1f}k"
 
-    return str(total_tokens)
+    return str(count)
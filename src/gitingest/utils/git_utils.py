@@ -116,3 +116,42 @@ async def fetch_remote_branch_list(url: str) -> List[str]:
         for line in stdout_decoded.splitlines()
         if line.strip() and "refs/heads/" in line
     ]
+
+
+async def fetch_remote_commit_sha(url: str, ref: str = "HEAD") -> str:
+    """
+    Resolve a ref of a remote Git repository to the commit SHA it currently points to.
+
+    `git ls-remote` matches every ref whose name ends in `/<ref>` (e.g. `refs/heads/a/master` for `master`), so the
+    output is filtered for an exact match: the ref itself, then the branch, then the (peeled) tag of that name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the Git repository.
+    ref : str
+        The branch name or ref to resolve (default is "HEAD").
+
+    Returns
+    -------
+    str
+        The commit SHA the ref points to.
+
+    Raises
+    ------
+    RuntimeError
+        If the ref cannot be found in the remote repository.
+    """
+    await ensure_git_installed()
+    stdout, _ = await run_command("git", "ls-remote", url, ref)
+
+    shas = {}
+    for line in stdout.decode().splitlines():
+        sha, _, refname = line.partition("\t")
+        shas[refname.strip()] = sha.strip()
+
+    for refname in (ref, f"refs/heads/{ref}", f"refs/tags/{ref}^{{}}", f"refs/tags/{ref}"):
+        if refname in shas:
+            return shas[refname]
+
+    raise RuntimeError(f"Ref '{ref}' not found in {url}")
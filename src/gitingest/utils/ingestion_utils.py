@@ -1,8 +1,11 @@
 """Utility functions for the ingestion process."""
 
-from fnmatch import fnmatch
+import os
+import re
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
-from typing import Set
+from typing import FrozenSet, Pattern, Set
 
 
 def _should_include(path: Path, base_path: Path, include_patterns: Set[str]) -> bool:
@@ -38,10 +41,7 @@ def _should_include(path: Path, base_path: Path, include_patterns: Set[str]) ->
     if path.is_dir():
         return True
 
-    for pattern in include_patterns:
-        if fnmatch(rel_str, pattern):
-            return True
-    return False
+    return _compile_patterns(frozenset(include_patterns)).match(os.path.normcase(rel_str)) is not None
 
 
 def _should_exclude(path: Path, base_path: Path, ignore_patterns: Set[str]) -> bool:
@@ -73,7 +73,29 @@ def _should_exclude(path: Path, base_path: Path, ignore_patterns: Set[str]) -> b
         return True
 
     rel_str = str(rel_path)
-    for pattern in ignore_patterns:
-        if pattern and fnmatch(rel_str, pattern):
-            return True
-    return False
+    return _compile_patterns(frozenset(ignore_patterns)).match(os.path.normcase(rel_str)) is not None
+
+
+@lru_cache(maxsize=4096)
+def _compile_patterns(patterns: FrozenSet[str]) -> Pattern[str]:
+    """
+    Compile a set of Unix shell-style patterns into a single regular expression.
+
+    Matching a path against the returned expression is equivalent to calling `fnmatch.fnmatch` with each pattern and
+    checking if any of them matches, but runs a single regex match instead of one `fnmatch` call per pattern. The
+    result is cached, so the patterns of a query are only compiled once for the whole traversal.
+
+    Parameters
+    ----------
+    patterns : FrozenSet[str]
+        The patterns to compile. Empty patterns are ignored.
+
+    Returns
+    -------
+    Pattern[str]
+        A compiled regular expression matching any of the patterns. If no pattern is given, it matches nothing.
+    """
+    translated = [translate(os.path.normcase(pattern)) for pattern in patterns if pattern]
+    if not translated:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(translated))
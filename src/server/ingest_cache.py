@@ -0,0 +1,269 @@
+"""Two-tier (memory + disk) cache for API ingestion results."""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from cachetools import TTLCache
+
+from server import server_config
+
+try:
+    GITINGEST_VERSION = version("gitingest")
+except PackageNotFoundError:
+    GITINGEST_VERSION = "unknown"
+
+
+def _result_size(result: Dict[str, Any]) -> int:
+    """Approximate the memory held by a cached result by the length of its summary, tree and content."""
+    data = result.get("data") or {}
+    return max(1, sum(len(value) for value in data.values() if isinstance(value, str)))
+
+
+# Bounded by the total size of the cached results rather than by their number, since one result can hold
+# hundreds of megabytes of content
+_memory_cache: TTLCache = TTLCache(
+    maxsize=server_config.INGEST_CACHE_MAX_MEMORY,
+    ttl=server_config.INGEST_CACHE_TTL,
+    getsizeof=_result_size,
+)
+
+
+def make_cache_key(
+    source: str,
+    branch: Optional[str],
+    commit: str,
+    include_patterns: Optional[Iterable[str]],
+    exclude_patterns: Optional[Iterable[str]],
+    max_file_size: Optional[int],
+    summary_only: bool = False,
+) -> str:
+    """
+    Build a stable cache key for an ingestion request.
+
+    The resolved commit SHA is part of the key, so a branch that moved on produces a new key instead of serving
+    stale results.
+
+    Parameters
+    ----------
+    source : str
+        The repository URL or slug as sent by the client.
+    branch : str, optional
+        The branch requested by the client.
+    commit : str
+        The commit SHA the requested ref currently resolves to.
+    include_patterns : Iterable[str], optional
+        The include patterns sent by the client.
+    exclude_patterns : Iterable[str], optional
+        The exclude patterns sent by the client.
+    max_file_size : int, optional
+        The maximum file size sent by the client.
+    summary_only : bool
+        Whether only the summary was requested (default is False).
+
+    Returns
+    -------
+    str
+        A hexadecimal digest identifying the request.
+    """
+    payload = json.dumps(
+        [
+            source,
+            branch,
+            commit,
+            sorted(include_patterns or []),
+            sorted(exclude_patterns or []),
+            max_file_size,
+            summary_only,
+        ]
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+async def get_cached_result(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up an ingestion result, first in memory and then on disk.
+
+    Disk entries written by another gitingest version or older than the TTL are ignored. A disk hit is promoted to
+    the in-memory cache. The disk entry is read and decoded in a worker thread, so large results do not block the
+    event loop.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by `make_cache_key`.
+
+    Returns
+    -------
+    Dict[str, Any], optional
+        The cached result, or `None` on a cache miss.
+    """
+    result = _memory_cache.get(key)
+    if result is not None:
+        return result
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(None, _read_disk_entry, key)
+    if result is not None:
+        _remember(key, result)
+    return result
+
+
+async def store_result(key: str, commit: str, result: Dict[str, Any]) -> None:
+    """
+    Store an ingestion result in memory and on disk.
+
+    The disk entry is encoded and written in a worker thread. Failing to write it is not fatal; the result stays
+    available from memory unless it is larger than the whole in-memory budget.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by `make_cache_key`.
+    commit : str
+        The commit SHA the result was produced from.
+    result : Dict[str, Any]
+        The JSON-serializable ingestion result.
+    """
+    _remember(key, result)
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _write_disk_entry, key, commit, result)
+
+
+def _remember(key: str, result: Dict[str, Any]) -> None:
+    """Keep a result in the in-memory cache, unless it alone exceeds the memory budget."""
+    if _result_size(result) <= _memory_cache.maxsize:
+        _memory_cache[key] = result
+
+
+def _read_disk_entry(key: str) -> Optional[Dict[str, Any]]:
+    """Read a fresh disk entry written by this gitingest version, or return `None`."""
+    path = server_config.CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > server_config.INGEST_CACHE_TTL:
+            return None
+        with path.open(encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if entry.get("version") != GITINGEST_VERSION:
+        return None
+
+    return entry["result"]
+
+
+def _write_disk_entry(key: str, commit: str, result: Dict[str, Any]) -> None:
+    """Write a disk entry atomically, logging (but not raising) write errors."""
+    entry = {"version": GITINGEST_VERSION, "commit": commit, "result": result}
+    path = server_config.CACHE_DIR / f"{key}.json"
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        tmp_path.replace(path)
+    except OSError as exc:
+        print(f"Error writing ingest cache entry {path}: {exc}")
+
+
+def get_artifact_path(key: str) -> Optional[Path]:
+    """
+    Return the path of the content artifact stored for a cache key.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by `make_cache_key`.
+
+    Returns
+    -------
+    Path, optional
+        The path of the artifact, or `None` if it does not exist or is older than the TTL.
+    """
+    path = server_config.CACHE_DIR / f"{key}.txt"
+    try:
+        if time.time() - path.stat().st_mtime > server_config.INGEST_CACHE_TTL:
+            return None
+    except OSError:
+        return None
+    return path
+
+
+async def store_artifact(key: str, content: str) -> Optional[int]:
+    """
+    Write the file contents of an ingestion result to a standalone artifact file.
+
+    The artifact is written once per cache key and reused while it is fresh, since the key already identifies the
+    exact commit and parameters it was produced from. The file is written in a worker thread.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by `make_cache_key`.
+    content : str
+        The file contents of the ingestion result.
+
+    Returns
+    -------
+    int, optional
+        The size of the artifact in bytes, or `None` if it could not be written.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _write_artifact, key, content)
+
+
+def _write_artifact(key: str, content: str) -> Optional[int]:
+    """Write an artifact file unless a fresh one exists, and return its size in bytes or `None` on failure."""
+    path = get_artifact_path(key)
+    if path is not None:
+        return path.stat().st_size
+
+    path = server_config.CACHE_DIR / f"{key}.txt"
+    # Concurrent writers of the same key (coalesced requests, identical batch items) each get their own temporary
+    # file, so none of them truncates a file another one is writing or has already renamed into place
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(content, encoding="utf-8")
+        tmp_path.replace(path)
+        return path.stat().st_size
+    except OSError as exc:
+        tmp_path.unlink(missing_ok=True)
+        if path.exists():
+            # Another writer of the same key won the race; its artifact has the same content
+            return path.stat().st_size
+        print(f"Error writing content artifact {path}: {exc}")
+        return None
+
+
+def remove_expired_entries() -> None:
+    """
+    Delete result, artifact and leftover temporary files older than the cache TTL from the cache directory.
+
+    Expired entries are already ignored on read; this keeps them from accumulating on disk. Subdirectories (such as
+    the repository mirrors) are left alone.
+    """
+    cutoff = time.time() - server_config.INGEST_CACHE_TTL
+    try:
+        paths = list(server_config.CACHE_DIR.iterdir())
+    except OSError:
+        return
+
+    for path in paths:
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError as exc:
+            print(f"Error removing expired cache entry {path}: {exc}")
+
+
+def clear_memory_cache() -> None:
+    """Drop every entry from the in-memory cache."""
+    _memory_cache.clear()
@@ -1,22 +1,72 @@
 """API endpoints for programmatic access to Gitingest functionality."""
 
-from typing import Dict, Optional, Set
+import asyncio
+import hashlib
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 
-from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel, Field
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 
-from gitingest.cloning import clone_repo
+from gitingest.cloning import checkout_from_mirror, remove_mirror_worktree
+from gitingest.config import MAX_FILE_SIZE, TMP_BASE_PATH
 from gitingest.ingestion import ingest_query
 from gitingest.query_parsing import IngestionQuery, parse_query
+from gitingest.utils.git_utils import fetch_remote_commit_sha
+from server.ingest_cache import (
+    get_artifact_path,
+    get_cached_result,
+    make_cache_key,
+    store_artifact,
+    store_result,
+)
+from server.server_config import (
+    ARTIFACT_MIN_CONTENT_SIZE,
+    BATCH_CONCURRENCY,
+    INGEST_CACHE_TTL,
+    MAX_BATCH_SIZE,
+    MIRRORS_DIR,
+    PARSE_CACHE_MAX_ENTRIES,
+    PARSE_CACHE_TTL,
+    STREAM_CHUNK_SIZE,
+)
 from server.server_utils import limiter
 
 router = APIRouter(prefix="/api/v1", tags=["api"])
 
+# Cheap shape check for sources, so malformed ones are rejected before any parsing or network access:
+# URLs, SSH remotes, absolute POSIX/Windows paths, and domain-less slugs such as "user/repo"
+SOURCE_PATTERN = r"^(https?://|git@|ssh://|/|[A-Za-z]:[\\/]|\w[\w.-]*/\S)"
+SOURCE_MAX_LENGTH = 2048
+_SOURCE_RE = re.compile(SOURCE_PATTERN)
+_CACHE_KEY_RE = re.compile(r"[0-9a-f]{32}")
+
+# ingest_query walks and reads the file system synchronously; run it off the event loop
+_INGEST_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="ingest")
+
+# Ingestions currently running, by cache key, so identical concurrent requests can await the same result
+_INFLIGHT_INGESTS: Dict[str, "asyncio.Future[IngestResponse]"] = {}
+
+# Parsed queries, so repeated requests for the same source skip URL parsing and the remote probes it performs
+_PARSED_QUERIES: TTLCache = TTLCache(maxsize=PARSE_CACHE_MAX_ENTRIES, ttl=PARSE_CACHE_TTL)
+
+
+class _IngestAbandoned(Exception):
+    """Raised to requests awaiting a coalesced ingestion whose owning request was cancelled."""
+
 
 class IngestRequest(BaseModel):
     """Request model for repository ingestion."""
     
-    source: str = Field(..., description="Git repository URL or local path")
+    source: str = Field(..., description="Git repository URL or local path", max_length=SOURCE_MAX_LENGTH)
     max_file_size: Optional[int] = Field(
         default=10 * 1024 * 1024, 
         description="Maximum file size to process in bytes",
@@ -35,15 +85,26 @@ class IngestRequest(BaseModel):
         default=None,
         description="Specific branch to clone and ingest"
     )
+    
+    @field_validator("source")
+    @classmethod
+    def _validate_source(cls, value: str) -> str:
+        value = value.strip()
+        if not _SOURCE_RE.match(value):
+            raise ValueError("source must be a repository URL, a user/repo slug or an absolute path")
+        return value
 
 
 class IngestResponse(BaseModel):
     """Response model for repository ingestion."""
     
     success: bool = Field(..., description="Whether the operation was successful")
-    data: Optional[Dict[str, str]] = Field(
+    data: Optional[Dict[str, Union[str, int]]] = Field(
         default=None,
-        description="Ingestion results containing summary, tree, and content"
+        description=(
+            "Ingestion results containing summary, tree, and content (or content_url and "
+            "content_bytes when the content is too large to inline)"
+        )
     )
     error: Optional[str] = Field(
         default=None,
@@ -55,17 +116,42 @@ class IngestResponse(BaseModel):
     )
 
 
+class BatchIngestRequest(BaseModel):
+    """Request model for ingesting several repositories at once."""
+    
+    items: List[IngestRequest] = Field(
+        ...,
+        description="Repositories to ingest",
+        min_length=1,
+        max_length=MAX_BATCH_SIZE
+    )
+
+
+class BatchIngestResponse(BaseModel):
+    """Response model for batch repository ingestion."""
+    
+    results: List[IngestResponse] = Field(
+        ...,
+        description="Ingestion results, in the same order as the request items"
+    )
+
+
 @router.post("/ingest", response_model=IngestResponse)
 @limiter.limit("5/minute")
-async def ingest_repository(request: Request, body: IngestRequest) -> IngestResponse:
+async def ingest_repository(request: Request, response: Response, body: IngestRequest) -> IngestResponse:
     """
     Ingest a Git repository and return structured results.
     
     This endpoint processes a Git repository URL or local path and returns
     the repository contents in a structured format suitable for LLMs.
+    Results for remote repositories are cached per resolved commit, so
+    repeated requests skip the clone and ingestion entirely. Cached results
+    with more than ARTIFACT_MIN_CONTENT_SIZE characters of content return a
+    content_url to download it from instead of the inline content.
     
     Args:
         request: FastAPI Request object (for rate limiting)
+        response: FastAPI Response object (for cache headers)
         body: IngestRequest containing source and processing parameters
         
     Returns:
@@ -74,61 +160,24 @@ async def ingest_repository(request: Request, body: IngestRequest) -> IngestResp
     Raises:
         HTTPException: If the request is invalid or processing fails
     """
-    try:
-        # Parse the query using existing logic
-        query: IngestionQuery = await parse_query(
-            source=body.source,
-            max_file_size=body.max_file_size,
-            from_web=True,
-            include_patterns=body.include_patterns,
-            ignore_patterns=body.exclude_patterns,
-        )
-        
-        # Override branch if specified in request
-        if body.branch:
-            query.branch = body.branch
-        
-        # Clone repository if it's a remote URL
-        if query.url:
-            clone_config = query.extract_clone_config()
-            await clone_repo(clone_config)
-        
-        # Perform ingestion
-        summary, tree, content = ingest_query(query)
-        
-        # Prepare metadata
-        metadata = {
-            "source_type": "remote" if query.url else "local",
-            "repository": f"{query.user_name}/{query.repo_name}" if query.user_name else query.slug,
-            "branch": query.branch or "default",
-            "subpath": query.subpath,
-        }
-        
-        return IngestResponse(
-            success=True,
-            data={
-                "summary": summary,
-                "tree": tree,
-                "content": content
-            },
-            metadata=metadata
-        )
-        
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        return IngestResponse(
-            success=False,
-            error=str(e)
-        )
+    result, cache_key = await _ingest_core(
+        source=body.source,
+        max_file_size=body.max_file_size,
+        include_patterns=body.include_patterns,
+        exclude_patterns=body.exclude_patterns,
+        branch=body.branch,
+    )
+    result = await _externalize_content(result, cache_key)
+    return _apply_cache_headers(request, response, result, cache_key)
 
 
 @router.get("/ingest", response_model=IngestResponse)
 @limiter.limit("5/minute")
 async def ingest_repository_get(
     request: Request,  # Required for slowapi rate limiter
-    source: str,
-    max_file_size: Optional[int] = 10 * 1024 * 1024,
+    response: Response,
+    source: str = Query(..., max_length=SOURCE_MAX_LENGTH, pattern=SOURCE_PATTERN),
+    max_file_size: Optional[int] = Query(default=10 * 1024 * 1024, ge=1024, le=100 * 1024 * 1024),
     include_patterns: Optional[str] = None,
     exclude_patterns: Optional[str] = None,
     branch: Optional[str] = None
@@ -140,6 +189,8 @@ async def ingest_repository_get(
     but accepts parameters as URL query parameters for easier testing.
     
     Args:
+        request: FastAPI Request object (for rate limiting)
+        response: FastAPI Response object (for cache headers)
         source: Git repository URL or local path
         max_file_size: Maximum file size to process in bytes
         include_patterns: Comma-separated patterns to include
@@ -158,30 +209,130 @@ async def ingest_repository_get(
     if exclude_patterns:
         exclude_set = {p.strip() for p in exclude_patterns.split(',') if p.strip()}
     
-    # Create request object and delegate to POST handler
-    body = IngestRequest(
+    result, cache_key = await _ingest_core(
         source=source,
         max_file_size=max_file_size,
         include_patterns=include_set,
         exclude_patterns=exclude_set,
-        branch=branch
+        branch=branch,
+    )
+    result = await _externalize_content(result, cache_key)
+    return _apply_cache_headers(request, response, result, cache_key)
+
+
+@router.post("/ingest/stream", response_class=StreamingResponse)
+@limiter.limit("5/minute")
+async def ingest_repository_stream(request: Request, body: IngestRequest) -> StreamingResponse:
+    """
+    Ingest a Git repository and stream the results as NDJSON.
+    
+    The response is a sequence of newline-delimited JSON objects: one with
+    the summary, one with the tree, the file contents split into
+    `content_chunk` frames of at most STREAM_CHUNK_SIZE characters, and a
+    final frame with the metadata and success flag. Clients can start
+    processing the summary and tree before the content has been received,
+    and the server never has to encode the whole content as one JSON string.
+    
+    Args:
+        request: FastAPI Request object (for rate limiting)
+        body: IngestRequest containing source and processing parameters
+        
+    Returns:
+        StreamingResponse emitting the ingestion results as NDJSON
+        
+    Raises:
+        HTTPException: If the request is invalid
+    """
+    result, _ = await _ingest_core(
+        source=body.source,
+        max_file_size=body.max_file_size,
+        include_patterns=body.include_patterns,
+        exclude_patterns=body.exclude_patterns,
+        branch=body.branch,
     )
+    return StreamingResponse(_stream_frames(result), media_type="application/x-ndjson")
+
+
+@router.post("/ingest/batch", response_model=BatchIngestResponse)
+@limiter.limit("1/minute")
+async def ingest_repository_batch(request: Request, body: BatchIngestRequest) -> BatchIngestResponse:
+    """
+    Ingest several repositories in a single request.
+    
+    The items are processed concurrently (at most BATCH_CONCURRENCY at a time)
+    and the results are returned in the same order as the request items. A
+    failing item does not fail the whole batch.
+    
+    Args:
+        request: FastAPI Request object (for rate limiting)
+        body: BatchIngestRequest containing the list of ingestion requests
+        
+    Returns:
+        BatchIngestResponse with one IngestResponse per requested item
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def _ingest_item(item: IngestRequest) -> IngestResponse:
+        async with semaphore:
+            try:
+                result, cache_key = await _ingest_core(
+                    source=item.source,
+                    max_file_size=item.max_file_size,
+                    include_patterns=item.include_patterns,
+                    exclude_patterns=item.exclude_patterns,
+                    branch=item.branch,
+                )
+            except HTTPException as e:
+                return IngestResponse(success=False, error=e.detail)
+            return await _externalize_content(result, cache_key)
+    
+    results = await asyncio.gather(*(_ingest_item(item) for item in body.items))
+    return BatchIngestResponse(results=list(results))
+
+
+@router.get("/ingest/artifact/{key}", response_class=FileResponse)
+async def get_content_artifact(request: Request, key: str) -> Response:
+    """
+    Download the file contents of a large ingestion result.
+    
+    The URL is returned as content_url by the ingest endpoints. Artifacts are
+    addressed by cache key, which covers the resolved commit and all request
+    parameters, so they never change and may be cached by clients and proxies.
+    
+    Args:
+        request: FastAPI Request object (for the If-None-Match header)
+        key: Cache key of the ingestion result
+        
+    Returns:
+        The file contents as plain text, or an empty 304 response if the client already has them
+        
+    Raises:
+        HTTPException: If no artifact exists for the key
+    """
+    path = get_artifact_path(key) if _CACHE_KEY_RE.fullmatch(key) else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Artifact not found or expired")
     
-    return await ingest_repository(request, body)
+    headers = {"ETag": f'"{key}"', "Cache-Control": f"public, max-age={INGEST_CACHE_TTL}, immutable"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(path, media_type="text/plain; charset=utf-8", headers=headers)
 
 
 @router.get("/ingest/summary", response_model=Dict[str, str])
 @limiter.limit("10/minute")
 async def get_repository_summary(
     request: Request,  # Required for slowapi rate limiter
-    source: str,
+    source: str = Query(..., max_length=SOURCE_MAX_LENGTH, pattern=SOURCE_PATTERN),
     branch: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Get only the summary information for a repository.
     
     This is a lightweight endpoint that returns only the summary
-    without the full directory tree and file contents.
+    without the full directory tree and file contents. File contents are
+    never read, so the summary does not include a token estimate.
     
     Args:
         request: FastAPI Request object (for rate limiting)
@@ -194,31 +345,354 @@ async def get_repository_summary(
     Raises:
         HTTPException: If the repository cannot be processed
     """
+    # Go straight to the shared core (no IngestRequest, no nested rate-limited route call);
+    # failures are already turned into HTTPException or an unsuccessful result there
+    result, _ = await _ingest_core(
+        source=source,
+        max_file_size=MAX_FILE_SIZE,
+        include_patterns=None,
+        exclude_patterns=None,
+        branch=branch,
+        summary_only=True,
+    )
+    
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.error)
+    
+    return {
+        "source": source,
+        "summary": result.data["summary"],
+        "repository": result.metadata.get("repository", ""),
+        "branch": result.metadata.get("branch", "")
+    }
+
+
+async def _ingest_core(
+    source: str,
+    max_file_size: Optional[int],
+    include_patterns: Optional[Set[str]],
+    exclude_patterns: Optional[Set[str]],
+    branch: Optional[str],
+    summary_only: bool = False,
+) -> Tuple[IngestResponse, Optional[str]]:
+    """
+    Ingest a repository, serving remote repositories from the cache when possible.
+    
+    The parameters are expected to be validated already, either through
+    IngestRequest or through the query parameter constraints of the GET route.
+    
+    Args:
+        source: Git repository URL or local path
+        max_file_size: Maximum file size to process in bytes
+        include_patterns: Patterns to include
+        exclude_patterns: Patterns to exclude
+        branch: Specific branch to clone and ingest
+        summary_only: Only compute the summary (tree and content are left empty)
+        
+    Returns:
+        The IngestResponse and the cache key of the result (None if it is not cacheable)
+        
+    Raises:
+        HTTPException: If the request is invalid
+    """
     try:
-        body = IngestRequest(source=source, branch=branch)
-        response = await ingest_repository(request, body)
+        # Parse the query using existing logic (memoized per source and patterns)
+        query = await _cached_parse_query(source, max_file_size, include_patterns, exclude_patterns)
+        
+        # Override branch if specified in request
+        if branch:
+            query.branch = branch
+        
+        # Serve remote repositories from the cache when the resolved commit was already ingested
+        cache_key = None
+        commit_sha = None
+        if query.url:
+            commit_sha = query.commit or await _resolve_commit_sha(query.url, query.branch)
+        if commit_sha:
+            cache_key = make_cache_key(
+                source,
+                branch,
+                commit_sha,
+                include_patterns,
+                exclude_patterns,
+                max_file_size,
+                summary_only,
+            )
+            cached = await get_cached_result(cache_key)
+            if cached is not None:
+                # Cached entries were produced by model_dump(), so skip re-validating the (possibly huge) content
+                return IngestResponse.model_construct(**cached), cache_key
+        
+        if not cache_key:
+            return await _run_ingestion(query, commit_sha, summary_only), None
+        
+        # Let concurrent identical requests share a single clone and ingestion
+        while cache_key in _INFLIGHT_INGESTS:
+            try:
+                return await asyncio.shield(_INFLIGHT_INGESTS[cache_key]), cache_key
+            except _IngestAbandoned:
+                # The request running the ingestion was cancelled; take over (or join whoever did)
+                continue
         
-        if not response.success:
-            raise HTTPException(status_code=400, detail=response.error)
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT_INGESTS[cache_key] = future
+        try:
+            result = await _run_ingestion(query, commit_sha, summary_only)
+        except asyncio.CancelledError:
+            # Waiters were not cancelled themselves, so let them retry instead of propagating the cancellation
+            future.set_exception(_IngestAbandoned())
+            future.exception()  # Mark as retrieved so an unawaited failure is not logged
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved so an unawaited failure is not logged
+            raise
+        finally:
+            _INFLIGHT_INGESTS.pop(cache_key, None)
         
-        return {
-            "source": source,
-            "summary": response.data["summary"],
-            "repository": response.metadata.get("repository", ""),
-            "branch": response.metadata.get("branch", "")
-        }
+        future.set_result(result)
+        await store_result(cache_key, commit_sha, result.model_dump())
+        return result, cache_key
         
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return IngestResponse(
+            success=False,
+            error=str(e)
+        ), None
+
+
+async def _cached_parse_query(
+    source: str,
+    max_file_size: Optional[int],
+    include_patterns: Optional[Set[str]],
+    exclude_patterns: Optional[Set[str]],
+) -> IngestionQuery:
+    """
+    Parse a query, reusing the result of an earlier identical parse.
+    
+    The cached query is never handed out directly: every caller gets a deep
+    copy with its own id and, for remote repositories, its own local path, so
+    overriding the branch or checking out the repository does not affect
+    other requests. Parsing errors are not cached.
+    
+    Args:
+        source: Git repository URL or local path
+        max_file_size: Maximum file size to process in bytes
+        include_patterns: Patterns to include
+        exclude_patterns: Patterns to exclude
+        
+    Returns:
+        A fresh IngestionQuery for this request
+    """
+    key = (source, max_file_size, frozenset(include_patterns or ()), frozenset(exclude_patterns or ()))
+    query = _PARSED_QUERIES.get(key)
+    if query is None:
+        query = await parse_query(
+            source=source,
+            max_file_size=max_file_size,
+            from_web=True,
+            include_patterns=include_patterns,
+            ignore_patterns=exclude_patterns,
+        )
+        _PARSED_QUERIES[key] = query
+    
+    query_id = str(uuid.uuid4())
+    local_path = TMP_BASE_PATH / query_id / query.slug if query.url else query.local_path
+    return query.model_copy(deep=True, update={"id": query_id, "local_path": local_path})
+
+
+async def _run_ingestion(
+    query: IngestionQuery,
+    commit_sha: Optional[str],
+    summary_only: bool = False,
+) -> IngestResponse:
+    """
+    Check out (if remote) and ingest a parsed query.
+    
+    Remote repositories are checked out as a worktree of a persistent local
+    mirror, so objects fetched by earlier requests are not downloaded again.
+    The worktree is removed once the ingestion is done.
+    
+    Args:
+        query: The parsed IngestionQuery
+        commit_sha: The resolved commit SHA, added to the metadata when known
+        summary_only: Only compute the summary (tree and content are left empty)
+        
+    Returns:
+        IngestResponse containing the ingestion results
+    """
+    # Check out the repository from its local mirror if it's a remote URL
+    if query.url:
+        clone_config = query.extract_clone_config()
+        if commit_sha:
+            # Check out exactly the commit the cache key was built from, even if the branch moved since
+            clone_config.commit = commit_sha
+        mirror_path = _mirror_path(query.url)
+        await checkout_from_mirror(clone_config, mirror_path)
+    
+    try:
+        # Perform ingestion
+        loop = asyncio.get_running_loop()
+        summary, tree, content = await loop.run_in_executor(
+            _INGEST_EXECUTOR, partial(ingest_query, query, summary_only=summary_only)
+        )
+    finally:
+        if query.url:
+            try:
+                await remove_mirror_worktree(str(query.local_path), mirror_path)
+            except RuntimeError as e:
+                print(f"Error removing worktree {query.local_path}: {e}")
+    
+    # Prepare metadata
+    metadata = {
+        "source_type": "remote" if query.url else "local",
+        "repository": f"{query.user_name}/{query.repo_name}" if query.user_name else query.slug,
+        "branch": query.branch or "default",
+        "subpath": query.subpath,
+    }
+    if commit_sha:
+        metadata["commit"] = commit_sha
+    
+    return IngestResponse(
+        success=True,
+        data={
+            "summary": summary,
+            "tree": tree,
+            "content": content
+        },
+        metadata=metadata
+    )
+
+
+def _mirror_path(url: str) -> Path:
+    """
+    Get the path of the persistent bare mirror for a repository.
+    
+    Args:
+        url: URL of the remote repository
+        
+    Returns:
+        Path of the mirror under MIRRORS_DIR
+    """
+    return MIRRORS_DIR / f"{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}.git"
+
+
+def _apply_cache_headers(
+    request: Request,
+    response: Response,
+    result: IngestResponse,
+    cache_key: Optional[str],
+) -> Union[IngestResponse, Response]:
+    """
+    Attach ETag/Cache-Control headers and answer conditional requests.
+    
+    Args:
+        request: FastAPI Request object (for the If-None-Match header)
+        response: FastAPI Response object to add the headers to
+        result: The IngestResponse to return
+        cache_key: Cache key of the result, or None if it is not cacheable
+        
+    Returns:
+        The result, an empty 304 response if a GET client already has it, or
+        an empty 412 response if a POST precondition on the ETag fails
+    """
+    if not cache_key:
+        return result
+    
+    etag = f'"{cache_key}"'
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if request.headers.get("if-none-match") == etag:
+        # 304 is only defined for GET/HEAD; other methods report the failed precondition (RFC 9110 §13.1.2)
+        status_code = 304 if request.method in ("GET", "HEAD") else 412
+        return Response(status_code=status_code, headers=dict(response.headers))
+    
+    return result
+
+
+async def _externalize_content(result: IngestResponse, cache_key: Optional[str]) -> IngestResponse:
+    """
+    Replace large inline content with a URL to download it from.
+    
+    The content is written once per cache key to an artifact file served by
+    get_content_artifact, so the JSON response only carries the summary and
+    tree. Uncacheable or small results are returned unchanged.
+    
+    Args:
+        result: The IngestResponse to return
+        cache_key: Cache key of the result, or None if it is not cacheable
+        
+    Returns:
+        The result, with content replaced by content_url and content_bytes if it is large
+    """
+    if not cache_key or not result.success or len(result.data["content"]) <= ARTIFACT_MIN_CONTENT_SIZE:
+        return result
+    
+    content_bytes = await store_artifact(cache_key, result.data["content"])
+    if content_bytes is None:
+        return result
+    
+    data = {
+        "summary": result.data["summary"],
+        "tree": result.data["tree"],
+        "content_url": f"{router.prefix}/ingest/artifact/{cache_key}",
+        "content_bytes": content_bytes,
+    }
+    return result.model_copy(update={"data": data})
+
+
+async def _stream_frames(result: IngestResponse) -> AsyncIterator[bytes]:
+    """
+    Encode an IngestResponse as NDJSON frames.
+    
+    Args:
+        result: The IngestResponse to encode
+        
+    Yields:
+        One encoded JSON object per line
+    """
+    if not result.success:
+        yield orjson.dumps({"success": False, "error": result.error}) + b"\n"
+        return
+    
+    yield orjson.dumps({"summary": result.data["summary"]}) + b"\n"
+    yield orjson.dumps({"tree": result.data["tree"]}) + b"\n"
+    
+    content = result.data["content"]
+    for start in range(0, len(content), STREAM_CHUNK_SIZE):
+        yield orjson.dumps({"content_chunk": content[start:start + STREAM_CHUNK_SIZE]}) + b"\n"
+    
+    yield orjson.dumps({"metadata": result.metadata, "success": True}) + b"\n"
+
+
+async def _resolve_commit_sha(url: str, branch: Optional[str]) -> Optional[str]:
+    """
+    Resolve the commit a remote branch currently points to.
+    
+    Args:
+        url: URL of the remote repository
+        branch: Branch to resolve, or None for the default branch
+        
+    Returns:
+        The commit SHA, or None if it could not be resolved (caching is skipped)
+    """
+    try:
+        return await fetch_remote_commit_sha(url, branch or "HEAD")
+    except RuntimeError:
+        return None
 
 
 @router.get("/health")
+@limiter.exempt
 async def api_health_check() -> Dict[str, str]:
     """
     Health check endpoint for the API.
     
+    Exempt from rate limiting so frequent load balancer probes never do
+    limiter bookkeeping or get throttled.
+    
     Returns:
         Simple status message indicating the API is operational
     """
@@ -1,5 +1,7 @@
 """Configuration for the server."""
 
+import os
+from pathlib import Path
 from typing import Dict, List
 
 from fastapi.templating import Jinja2Templates
@@ -7,6 +9,21 @@ from fastapi.templating import Jinja2Templates
 MAX_DISPLAY_SIZE: int = 300_000
 DELETE_REPO_AFTER: int = 60 * 60  # In seconds
 
+CACHE_DIR: Path = Path(os.getenv("GITINGEST_CACHE_DIR", Path.home() / ".cache" / "gitingest"))
+INGEST_CACHE_MAX_MEMORY: int = 256 * 1024 * 1024  # Characters of cached results kept in memory
+INGEST_CACHE_TTL: int = 60 * 60  # In seconds
+MIRRORS_DIR: Path = CACHE_DIR / "mirrors"  # Persistent bare mirrors of ingested repositories
+MIRROR_MAX_IDLE: int = 24 * 60 * 60  # In seconds; unused mirrors are deleted after this
+
+PARSE_CACHE_MAX_ENTRIES: int = 1024
+PARSE_CACHE_TTL: int = 10 * 60  # In seconds
+
+MAX_BATCH_SIZE: int = 20  # Maximum number of repositories per batch request
+BATCH_CONCURRENCY: int = 4  # Maximum number of repositories ingested concurrently per batch request
+
+STREAM_CHUNK_SIZE: int = 64 * 1024  # Characters of file content per streamed NDJSON frame
+ARTIFACT_MIN_CONTENT_SIZE: int = 1024 * 1024  # Characters of file content above which it is served as an artifact
+
 
 EXAMPLE_REPOS: List[Dict[str, str]] = [
     {"name": "Gitingest", "url": "https://github.com/cyclotruc/gitingest"},
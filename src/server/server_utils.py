@@ -13,8 +13,10 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from gitingest.cloning import prune_mirrors
 from gitingest.config import TMP_BASE_PATH
-from server.server_config import DELETE_REPO_AFTER
+from server.ingest_cache import remove_expired_entries
+from server.server_config import DELETE_REPO_AFTER, MIRROR_MAX_IDLE, MIRRORS_DIR
 
 # Initialize a rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -61,17 +63,23 @@ async def lifespan(_: FastAPI):
     Yields
     -------
     None
-        Yields control back to the FastAPI application while the background task runs.
+        Yields control back to the FastAPI application while the background tasks run.
     """
-    task = asyncio.create_task(_remove_old_repositories())
+    tasks = [
+        asyncio.create_task(_remove_old_repositories()),
+        asyncio.create_task(_remove_expired_cache_entries()),
+        asyncio.create_task(_prune_idle_mirrors()),
+    ]
 
     yield
-    # Cancel the background task on shutdown
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    # Cancel the background tasks on shutdown
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 
 async def _remove_old_repositories():
@@ -110,6 +118,39 @@ async def _remove_old_repositories():
         await asyncio.sleep(60)
 
 
+async def _remove_expired_cache_entries():
+    """
+    Periodically remove expired ingest cache entries.
+
+    Background task that deletes cached results and content artifacts older than the cache TTL every 60 seconds.
+    The directory scan runs in a worker thread so it does not block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, remove_expired_entries)
+        except Exception as exc:
+            print(f"Error in _remove_expired_cache_entries: {exc}")
+
+        await asyncio.sleep(60)
+
+
+async def _prune_idle_mirrors():
+    """
+    Periodically clean up the repository mirrors used by the API.
+
+    Background task that, every hour, prunes stale worktrees from the mirrors, deletes mirrors unused for more than
+    MIRROR_MAX_IDLE seconds and garbage-collects the others.
+    """
+    while True:
+        try:
+            await prune_mirrors(MIRRORS_DIR, MIRROR_MAX_IDLE)
+        except Exception as exc:
+            print(f"Error in _prune_idle_mirrors: {exc}")
+
+        await asyncio.sleep(60 * 60)
+
+
 async def _process_folder(folder: Path) -> None:
     """
     Process a single folder for deletion and logging.
@@ -1,20 +1,90 @@
 """Tests for the API endpoints."""
 
+import asyncio
 import json
+import os
+import threading
+import time
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from cachetools import TTLCache
 from fastapi.testclient import TestClient
 
+from gitingest.query_parsing import IngestionQuery
+from server import ingest_cache, server_config
+from server.ingest_cache import (
+    clear_memory_cache,
+    get_cached_result,
+    remove_expired_entries,
+    store_artifact,
+    store_result,
+)
 from server.main import app
+from server.routers.api import _PARSED_QUERIES, IngestResponse, _cached_parse_query, _ingest_core
+from server.server_utils import limiter
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Share one test client for the API app across the whole test session."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def fake_query() -> IngestionQuery:
+    """Provide the parsed query of a remote repository, as returned by `parse_query`."""
+    return IngestionQuery(
+        user_name="test",
+        repo_name="repo",
+        url="https://github.com/test/repo",
+        local_path=Path("/tmp/gitingest/test-id") / "test-repo",
+        slug="test-repo",
+        id="test-id",
+        branch="main",
+    )
+
+
+@pytest.fixture
+def local_query() -> IngestionQuery:
+    """Provide the parsed query of a local directory, as returned by `parse_query`."""
+    return IngestionQuery(
+        local_path=Path("/path/to/local/project"),
+        slug="local-project",
+        id="test-id",
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_ingest_cache(tmp_path, monkeypatch):
+    """Give every test an empty ingest cache backed by a temporary directory."""
+    monkeypatch.setattr(server_config, "CACHE_DIR", tmp_path / "cache")
+    clear_memory_cache()
+    _PARSED_QUERIES.clear()
+    yield
+    clear_memory_cache()
+    _PARSED_QUERIES.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Start every test with fresh rate-limit buckets."""
+    limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def fake_remote_commit():
+    """Resolve every remote branch to a fixed commit instead of running `git ls-remote` over the network."""
+    with patch("server.routers.api.fetch_remote_commit_sha", new_callable=AsyncMock) as mock_fetch_sha:
+        mock_fetch_sha.return_value = "f" * 40
+        yield mock_fetch_sha
 
 
 class TestAPIEndpoints:
     """Test class for API endpoints."""
 
-    def test_api_health_check(self):
+    def test_api_health_check(self, client):
         """Test the API health check endpoint."""
         response = client.get("/api/v1/health")
         assert response.status_code == 200
@@ -22,20 +92,35 @@ class TestAPIEndpoints:
         assert data["status"] == "healthy"
         assert data["service"] == "gitingest-api"
 
-    @patch("server.routers.api.clone_repo")
+    def test_api_health_check_is_not_rate_limited(self, client):
+        """Test that health probes are exempt from rate limiting."""
+        for _ in range(20):
+            response = client.get("/api/v1/health")
+            assert response.status_code == 200
+
+    def test_rate_limit_buckets_are_per_endpoint(self, client):
+        """Test that exhausting the ingest limit does not affect the summary endpoint."""
+        result = {"success": True, "data": {"summary": "summary", "tree": "", "content": ""}, "metadata": {}}
+        with patch("server.routers.api._ingest_core", new_callable=AsyncMock) as mock_ingest:
+            mock_ingest.return_value = (IngestResponse(**result), None)
+
+            for _ in range(5):
+                assert client.get("/api/v1/ingest", params={"source": "test/repo"}).status_code == 200
+            assert client.get("/api/v1/ingest", params={"source": "test/repo"}).status_code == 429
+
+            response = client.get("/api/v1/ingest/summary", params={"source": "test/repo"})
+            assert response.status_code == 200
+
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.checkout_from_mirror")
     @patch("server.routers.api.ingest_query")
     @patch("server.routers.api.parse_query")
-    def test_ingest_repository_post_success(self, mock_parse_query, mock_ingest_query, mock_clone_repo):
+    def test_ingest_repository_post_success(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_remove_worktree, client, fake_query
+    ):
         """Test successful repository ingestion via POST."""
         # Mock parse_query
-        mock_query = AsyncMock()
-        mock_query.url = "https://github.com/test/repo"
-        mock_query.user_name = "test"
-        mock_query.repo_name = "repo"
-        mock_query.branch = "main"
-        mock_query.subpath = "/"
-        mock_query.extract_clone_config.return_value = AsyncMock()
-        mock_parse_query.return_value = mock_query
+        mock_parse_query.return_value = fake_query
 
         # Mock ingest_query
         mock_ingest_query.return_value = (
@@ -44,8 +129,8 @@ class TestAPIEndpoints:
             "FILE: src/main.py\n...\n\nFILE: README.md\n..."
         )
 
-        # Mock clone_repo
-        mock_clone_repo.return_value = None
+        # Mock the mirror checkout
+        mock_checkout.return_value = None
 
         request_data = {
             "source": "https://github.com/test/repo",
@@ -65,7 +150,254 @@ class TestAPIEndpoints:
         assert data["metadata"]["source_type"] == "remote"
         assert data["metadata"]["repository"] == "test/repo"
 
-    def test_ingest_repository_post_invalid_data(self):
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.fetch_remote_commit_sha")
+    @patch("server.routers.api.checkout_from_mirror")
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    def test_ingest_repository_cache_hit(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_fetch_sha, mock_remove_worktree,
+        client, fake_query
+    ):
+        """Test that a repeated request for the same commit is served from the cache."""
+        mock_parse_query.return_value = fake_query
+        mock_ingest_query.return_value = ("summary", "tree", "content")
+        mock_checkout.return_value = None
+        mock_fetch_sha.return_value = "a" * 40
+
+        request_data = {"source": "https://github.com/test/cached"}
+
+        first = client.post("/api/v1/ingest", json=request_data)
+        second = client.post("/api/v1/ingest", json=request_data)
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json() == second.json()
+        assert first.json()["metadata"]["commit"] == "a" * 40
+        assert first.headers["etag"] == second.headers["etag"]
+        mock_checkout.assert_called_once()
+        mock_ingest_query.assert_called_once()
+
+        # A client revalidating with the ETag gets an empty 304 on GET, and a failed precondition on POST
+        revalidated = client.get(
+            "/api/v1/ingest", params=request_data, headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == first.headers["etag"]
+        precondition_failed = client.post(
+            "/api/v1/ingest", json=request_data, headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert precondition_failed.status_code == 412
+
+        # A new commit on the branch invalidates the entry
+        mock_fetch_sha.return_value = "b" * 40
+        third = client.post("/api/v1/ingest", json=request_data)
+        assert third.status_code == 200
+        assert mock_checkout.call_count == 2
+
+    async def test_oversized_result_is_only_cached_on_disk(self, monkeypatch):
+        """Test that results larger than the in-memory budget are served from disk instead of memory."""
+        small_cache = TTLCache(maxsize=100, ttl=server_config.INGEST_CACHE_TTL, getsizeof=ingest_cache._result_size)
+        monkeypatch.setattr(ingest_cache, "_memory_cache", small_cache)
+        small = {"success": True, "data": {"summary": "s", "tree": "t", "content": "c"}, "metadata": {}}
+        large = {"success": True, "data": {"summary": "s", "tree": "t", "content": "x" * 1000}, "metadata": {}}
+
+        await store_result("small", "a" * 40, small)
+        await store_result("large", "a" * 40, large)
+
+        assert "small" in ingest_cache._memory_cache
+        assert "large" not in ingest_cache._memory_cache
+        assert await get_cached_result("large") == large
+
+    def test_remove_expired_entries(self):
+        """Test that cache files older than the TTL are deleted and fresh ones are kept."""
+        server_config.CACHE_DIR.mkdir(parents=True)
+        (server_config.CACHE_DIR / "mirrors").mkdir()
+        fresh = server_config.CACHE_DIR / "fresh.json"
+        expired = server_config.CACHE_DIR / "expired.txt"
+        fresh.write_text("{}")
+        expired.write_text("content")
+        old = time.time() - server_config.INGEST_CACHE_TTL - 1
+        os.utime(expired, (old, old))
+
+        remove_expired_entries()
+
+        assert fresh.exists()
+        assert not expired.exists()
+        assert (server_config.CACHE_DIR / "mirrors").exists()
+
+    async def test_concurrent_artifact_writes(self):
+        """Test that concurrent writers of the same artifact all succeed and leave one complete file."""
+        content = "x" * 10 * 1024 * 1024
+
+        sizes = await asyncio.gather(*(store_artifact("a" * 32, content) for _ in range(4)))
+
+        assert sizes == [len(content)] * 4
+        assert (server_config.CACHE_DIR / f"{'a' * 32}.txt").read_text() == content
+        assert [path.name for path in server_config.CACHE_DIR.iterdir()] == [f"{'a' * 32}.txt"]
+
+    @patch("server.routers.api.ARTIFACT_MIN_CONTENT_SIZE", 10)
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.fetch_remote_commit_sha")
+    @patch("server.routers.api.checkout_from_mirror")
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    def test_large_content_is_served_as_artifact(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_fetch_sha, mock_remove_worktree,
+        client, fake_query
+    ):
+        """Test that large content is replaced by a content_url serving it as a cacheable artifact."""
+        mock_parse_query.return_value = fake_query
+        mock_ingest_query.return_value = ("summary", "tree", "FILE: main.py\nprint('ü')\n")
+        mock_fetch_sha.return_value = "d" * 40
+
+        response = client.post("/api/v1/ingest", json={"source": "https://github.com/test/large"})
+        assert response.status_code == 200
+
+        data = response.json()["data"]
+        assert "content" not in data
+        assert data["content_bytes"] == len("FILE: main.py\nprint('ü')\n".encode())
+        assert data["content_url"].startswith("/api/v1/ingest/artifact/")
+
+        artifact = client.get(data["content_url"])
+        assert artifact.status_code == 200
+        assert artifact.text == "FILE: main.py\nprint('ü')\n"
+        assert artifact.headers["content-type"].startswith("text/plain")
+        assert artifact.headers["cache-control"] == "public, max-age=3600, immutable"
+
+        revalidated = client.get(data["content_url"], headers={"If-None-Match": artifact.headers["etag"]})
+        assert revalidated.status_code == 304
+
+    def test_missing_artifact_returns_404(self, client):
+        """Test that unknown or malformed artifact keys are not found."""
+        assert client.get("/api/v1/ingest/artifact/" + "0" * 32).status_code == 404
+        assert client.get("/api/v1/ingest/artifact/..passwd").status_code == 404
+
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    def test_ingest_query_runs_off_event_loop(self, mock_parse_query, mock_ingest_query, client, local_query):
+        """Test that the synchronous ingestion runs in the ingest worker pool."""
+        mock_parse_query.return_value = local_query
+
+        thread_names = []
+
+        def fake_ingest_query(query, summary_only=False):
+            thread_names.append(threading.current_thread().name)
+            return ("summary", "tree", "content")
+
+        mock_ingest_query.side_effect = fake_ingest_query
+
+        response = client.post("/api/v1/ingest", json={"source": "/path/to/local/project"})
+        assert response.status_code == 200
+        assert len(thread_names) == 1
+        assert thread_names[0].startswith("ingest")
+
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.fetch_remote_commit_sha")
+    @patch("server.routers.api.checkout_from_mirror")
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    async def test_concurrent_identical_requests_are_coalesced(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_fetch_sha, mock_remove_worktree, fake_query
+    ):
+        """Test that identical concurrent ingestions share a single clone and ingestion."""
+        mock_parse_query.return_value = fake_query
+        mock_ingest_query.return_value = ("summary", "tree", "content")
+        mock_fetch_sha.return_value = "c" * 40
+
+        async def slow_checkout(config, mirror_path):
+            await asyncio.sleep(0.05)
+
+        mock_checkout.side_effect = slow_checkout
+
+        params = {
+            "source": "https://github.com/test/popular",
+            "max_file_size": 1048576,
+            "include_patterns": None,
+            "exclude_patterns": None,
+            "branch": None,
+        }
+        results = await asyncio.gather(*(_ingest_core(**params) for _ in range(3)))
+
+        assert all(result.success for result, _ in results)
+        assert len({cache_key for _, cache_key in results}) == 1
+        mock_checkout.assert_called_once()
+        mock_ingest_query.assert_called_once()
+
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.fetch_remote_commit_sha")
+    @patch("server.routers.api.checkout_from_mirror")
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    async def test_coalesced_requests_survive_owner_cancellation(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_fetch_sha, mock_remove_worktree, fake_query
+    ):
+        """Test that requests waiting on a cancelled ingestion run it themselves instead of being cancelled."""
+        mock_parse_query.return_value = fake_query
+        mock_ingest_query.return_value = ("summary", "tree", "content")
+        mock_fetch_sha.return_value = "e" * 40
+
+        async def slow_checkout(config, mirror_path):
+            await asyncio.sleep(0.05)
+
+        mock_checkout.side_effect = slow_checkout
+
+        params = {
+            "source": "https://github.com/test/repo",
+            "max_file_size": 1048576,
+            "include_patterns": None,
+            "exclude_patterns": None,
+            "branch": None,
+        }
+        owner = asyncio.create_task(_ingest_core(**params))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(_ingest_core(**params)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        results = await asyncio.gather(*waiters)
+
+        assert owner.cancelled()
+        assert all(result.success for result, _ in results)
+        assert mock_checkout.call_count == 2
+
+    @patch("server.routers.api.parse_query")
+    async def test_parse_query_is_memoized(self, mock_parse_query, fake_query):
+        """Test that identical requests share one parse but each get an independent copy of the query."""
+        mock_parse_query.return_value = fake_query.model_copy(update={"branch": None, "ignore_patterns": {"*.log"}})
+
+        first = await _cached_parse_query("https://github.com/test/repo", 1048576, {"*.py"}, {"*.log"})
+        first.branch = "develop"
+        first.ignore_patterns.add("*.tmp")
+        second = await _cached_parse_query("https://github.com/test/repo", 1048576, {"*.py"}, {"*.log"})
+
+        mock_parse_query.assert_called_once()
+        assert second.branch is None
+        assert second.ignore_patterns == {"*.log"}
+        assert first.id != second.id
+        assert first.local_path != second.local_path
+        assert second.local_path.name == "test-repo"
+
+        # Different patterns are parsed separately
+        await _cached_parse_query("https://github.com/test/repo", 1048576, {"*.md"}, {"*.log"})
+        assert mock_parse_query.call_count == 2
+
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    def test_large_response_is_gzip_compressed(self, mock_parse_query, mock_ingest_query, client, local_query):
+        """Test that large responses are gzip-compressed for clients that accept it."""
+        mock_parse_query.return_value = local_query
+        mock_ingest_query.return_value = ("summary", "tree", "print('Hello')\n" * 1000)
+
+        response = client.post(
+            "/api/v1/ingest",
+            json={"source": "/path/to/local/project"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["data"]["content"] == "print('Hello')\n" * 1000
+
+    def test_ingest_repository_post_invalid_data(self, client):
         """Test repository ingestion with invalid data."""
         request_data = {
             "source": "",  # Empty source should fail validation
@@ -75,20 +407,16 @@ class TestAPIEndpoints:
         response = client.post("/api/v1/ingest", json=request_data)
         assert response.status_code == 422  # Validation error
 
-    @patch("server.routers.api.clone_repo")
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.checkout_from_mirror")
     @patch("server.routers.api.ingest_query")
     @patch("server.routers.api.parse_query")
-    def test_ingest_repository_get_success(self, mock_parse_query, mock_ingest_query, mock_clone_repo):
+    def test_ingest_repository_get_success(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_remove_worktree, client, fake_query
+    ):
         """Test successful repository ingestion via GET."""
         # Mock parse_query
-        mock_query = AsyncMock()
-        mock_query.url = "https://github.com/test/repo"
-        mock_query.user_name = "test"
-        mock_query.repo_name = "repo"
-        mock_query.branch = "main"
-        mock_query.subpath = "/"
-        mock_query.extract_clone_config.return_value = AsyncMock()
-        mock_parse_query.return_value = mock_query
+        mock_parse_query.return_value = fake_query
 
         # Mock ingest_query
         mock_ingest_query.return_value = (
@@ -97,8 +425,8 @@ class TestAPIEndpoints:
             "FILE: main.py\n...\n\nFILE: README.md\n..."
         )
 
-        # Mock clone_repo
-        mock_clone_repo.return_value = None
+        # Mock the mirror checkout
+        mock_checkout.return_value = None
 
         response = client.get(
             "/api/v1/ingest",
@@ -117,20 +445,16 @@ class TestAPIEndpoints:
         assert "tree" in data["data"]
         assert "content" in data["data"]
 
-    @patch("server.routers.api.clone_repo")
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.checkout_from_mirror")
     @patch("server.routers.api.ingest_query")
     @patch("server.routers.api.parse_query")
-    def test_get_repository_summary_success(self, mock_parse_query, mock_ingest_query, mock_clone_repo):
+    def test_get_repository_summary_success(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_remove_worktree, client, fake_query
+    ):
         """Test successful repository summary retrieval."""
         # Mock parse_query
-        mock_query = AsyncMock()
-        mock_query.url = "https://github.com/test/repo"
-        mock_query.user_name = "test"
-        mock_query.repo_name = "repo"
-        mock_query.branch = "main"
-        mock_query.subpath = "/"
-        mock_query.extract_clone_config.return_value = AsyncMock()
-        mock_parse_query.return_value = mock_query
+        mock_parse_query.return_value = fake_query
 
         # Mock ingest_query
         mock_ingest_query.return_value = (
@@ -139,8 +463,8 @@ class TestAPIEndpoints:
             "content..."
         )
 
-        # Mock clone_repo
-        mock_clone_repo.return_value = None
+        # Mock the mirror checkout
+        mock_checkout.return_value = None
 
         response = client.get(
             "/api/v1/ingest/summary",
@@ -159,19 +483,94 @@ class TestAPIEndpoints:
         assert data["source"] == "https://github.com/test/repo"
         assert "test/repo" in data["summary"]
 
-    def test_get_repository_summary_missing_source(self):
+        # The summary endpoint never builds the tree or reads file contents
+        assert mock_ingest_query.call_args.kwargs == {"summary_only": True}
+
+    @patch("server.routers.api.STREAM_CHUNK_SIZE", 4)
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.checkout_from_mirror")
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    def test_ingest_repository_stream(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_remove_worktree, client, local_query
+    ):
+        """Test streaming ingestion emits summary, tree, chunked content and metadata as NDJSON."""
+        mock_parse_query.return_value = local_query
+        mock_ingest_query.return_value = ("summary", "tree", "0123456789")
+
+        response = client.post("/api/v1/ingest/stream", json={"source": "/path/to/local/project"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert frames[0] == {"summary": "summary"}
+        assert frames[1] == {"tree": "tree"}
+        assert [frame["content_chunk"] for frame in frames[2:-1]] == ["0123", "4567", "89"]
+        assert frames[-1]["success"] is True
+        assert frames[-1]["metadata"]["repository"] == "local-project"
+        mock_checkout.assert_not_called()
+
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.checkout_from_mirror")
+    @patch("server.routers.api.ingest_query")
+    @patch("server.routers.api.parse_query")
+    def test_ingest_repository_batch(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_remove_worktree, client, local_query
+    ):
+        """Test batch ingestion returns one result per item, in order, without failing the batch."""
+
+        async def fake_parse_query(source, **kwargs):
+            if source == "/bad/project":
+                raise ValueError("Invalid repository URL")
+            return local_query
+
+        mock_parse_query.side_effect = fake_parse_query
+        mock_ingest_query.return_value = ("summary", "tree", "content")
+
+        response = client.post(
+            "/api/v1/ingest/batch",
+            json={"items": [{"source": "/good/project"}, {"source": "/bad/project"}]},
+        )
+        assert response.status_code == 200
+
+        results = response.json()["results"]
+        assert len(results) == 2
+        assert results[0]["success"] is True
+        assert results[0]["data"]["summary"] == "summary"
+        assert results[1]["success"] is False
+        assert "Invalid repository URL" in results[1]["error"]
+        mock_checkout.assert_not_called()
+
+    def test_ingest_repository_batch_too_large(self, client):
+        """Test that batches above the maximum size are rejected."""
+        response = client.post(
+            "/api/v1/ingest/batch",
+            json={"items": [{"source": f"/path/{i}"} for i in range(21)]},
+        )
+        assert response.status_code == 422
+
+    @patch("server.routers.api.parse_query")
+    def test_get_repository_summary_failure(self, mock_parse_query, client):
+        """Test that a failing summary ingestion is reported as a client error."""
+        mock_parse_query.side_effect = RuntimeError("Repository not found, make sure it is public")
+
+        response = client.get("/api/v1/ingest/summary", params={"source": "https://github.com/test/missing"})
+        assert response.status_code == 400
+        assert "Repository not found" in response.json()["detail"]
+
+    def test_get_repository_summary_missing_source(self, client):
         """Test repository summary with missing source parameter."""
         response = client.get("/api/v1/ingest/summary")
         assert response.status_code == 422  # Missing required parameter
 
     @patch("server.routers.api.parse_query")
-    def test_ingest_repository_error_handling(self, mock_parse_query):
+    def test_ingest_repository_error_handling(self, mock_parse_query, client):
         """Test error handling in repository ingestion."""
         # Mock parse_query to raise an exception
         mock_parse_query.side_effect = ValueError("Invalid repository URL")
 
         request_data = {
-            "source": "invalid-url",
+            "source": "https://github.com/test/invalid",
             "max_file_size": 1048576
         }
 
@@ -180,14 +579,32 @@ class TestAPIEndpoints:
         data = response.json()
         assert "Invalid repository URL" in data["detail"]
 
-    def test_pattern_parsing_in_get_request(self):
+    @patch("server.routers.api.parse_query")
+    def test_malformed_source_is_rejected_before_parsing(self, mock_parse_query, client):
+        """Test that sources that are not URLs, slugs or absolute paths fail validation without being parsed."""
+        for source in ("invalid-url", "../relative/path", "ftp://example.com/repo", "x" * 3000):
+            response = client.post("/api/v1/ingest", json={"source": source})
+            assert response.status_code == 422
+
+        response = client.get("/api/v1/ingest", params={"source": "invalid-url"})
+        assert response.status_code == 422
+
+        response = client.get("/api/v1/ingest/summary", params={"source": "invalid-url"})
+        assert response.status_code == 422
+
+        mock_parse_query.assert_not_called()
+
+    def test_pattern_parsing_in_get_request(self, client):
         """Test that comma-separated patterns are correctly parsed in GET requests."""
-        with patch("server.routers.api.ingest_repository") as mock_ingest:
-            mock_ingest.return_value = {
-                "success": True,
-                "data": {"summary": "test", "tree": "test", "content": "test"},
-                "metadata": {}
-            }
+        with patch("server.routers.api._ingest_core", new_callable=AsyncMock) as mock_ingest:
+            mock_ingest.return_value = (
+                {
+                    "success": True,
+                    "data": {"summary": "test", "tree": "test", "content": "test"},
+                    "metadata": {}
+                },
+                None,
+            )
 
             response = client.get(
                 "/api/v1/ingest",
@@ -197,13 +614,22 @@ class TestAPIEndpoints:
                     "exclude_patterns": "*.log,  *.tmp "
                 }
             )
+            assert response.status_code == 200
 
             # Verify that the patterns were correctly parsed
-            call_args = mock_ingest.call_args[0][0]
-            assert call_args.include_patterns == {"*.py", "*.md", "*.txt"}
-            assert call_args.exclude_patterns == {"*.log", "*.tmp"}
+            call_kwargs = mock_ingest.call_args.kwargs
+            assert call_kwargs["include_patterns"] == {"*.py", "*.md", "*.txt"}
+            assert call_kwargs["exclude_patterns"] == {"*.log", "*.tmp"}
+
+    def test_get_request_validation_constraints(self, client):
+        """Test that GET query parameters are validated without building an IngestRequest."""
+        response = client.get(
+            "/api/v1/ingest",
+            params={"source": "https://github.com/test/repo", "max_file_size": 500}
+        )
+        assert response.status_code == 422
 
-    def test_request_validation_constraints(self):
+    def test_request_validation_constraints(self, client):
         """Test request validation constraints."""
         # Test file size too small
         response = client.post("/api/v1/ingest", json={
@@ -219,20 +645,16 @@ class TestAPIEndpoints:
         })
         assert response.status_code == 422
 
-    @patch("server.routers.api.clone_repo")
+    @patch("server.routers.api.remove_mirror_worktree")
+    @patch("server.routers.api.checkout_from_mirror")
     @patch("server.routers.api.ingest_query")
     @patch("server.routers.api.parse_query")
-    def test_local_path_ingestion(self, mock_parse_query, mock_ingest_query, mock_clone_repo):
+    def test_local_path_ingestion(
+        self, mock_parse_query, mock_ingest_query, mock_checkout, mock_remove_worktree, client, local_query
+    ):
         """Test ingestion of local path (no cloning needed)."""
         # Mock parse_query for local path
-        mock_query = AsyncMock()
-        mock_query.url = None  # No URL for local path
-        mock_query.user_name = None
-        mock_query.repo_name = None
-        mock_query.slug = "local-project"
-        mock_query.branch = None
-        mock_query.subpath = "/"
-        mock_parse_query.return_value = mock_query
+        mock_parse_query.return_value = local_query
 
         # Mock ingest_query
         mock_ingest_query.return_value = (
@@ -254,8 +676,8 @@ class TestAPIEndpoints:
         assert data["metadata"]["source_type"] == "local"
         assert data["metadata"]["repository"] == "local-project"
 
-        # Ensure clone_repo was not called for local path
-        mock_clone_repo.assert_not_called()
+        # Ensure nothing was checked out for local path
+        mock_checkout.assert_not_called()
 
 
 # Integration tests (require actual network access)
@@ -263,7 +685,7 @@ class TestAPIEndpoints:
 class TestAPIIntegration:
     """Integration tests for API endpoints (require network access)."""
 
-    def test_real_repository_ingestion(self):
+    def test_real_repository_ingestion(self, client):
         """Test ingestion of a real small repository."""
         request_data = {
             "source": "https://github.com/octocat/Hello-World",
@@ -279,7 +701,7 @@ class TestAPIIntegration:
         assert "Hello-World" in data["data"]["summary"]
         assert "README" in data["data"]["tree"]
 
-    def test_real_repository_summary(self):
+    def test_real_repository_summary(self, client):
         """Test summary endpoint with a real repository."""
         response = client.get(
             "/api/v1/ingest/summary",
@@ -6,13 +6,16 @@ including filtering patterns and subpaths.
 """
 
 import re
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Set, TypedDict
 
 import pytest
 
 from gitingest.ingestion import ingest_query
+from gitingest.output_formatters import BYTES_PER_TOKEN
 from gitingest.query_parsing import IngestionQuery
+from gitingest.utils.ingestion_utils import _compile_patterns
 
 
 def test_run_ingest_query(temp_directory: Path, sample_query: IngestionQuery) -> None:
@@ -230,3 +233,52 @@ def test_include_ignore_patterns(
     # check non-presence of non-included directories in structure
     for expected_not_structure_item in pattern_scenario["expected_not_structure"]:
         assert expected_not_structure_item not in structure
+
+
+@pytest.mark.parametrize(
+    "rel_path",
+    ["file1.txt", "src/subfile2.py", "src/subdir/file_subdir.py", "dir1/file_dir1.txt", ".git", "node_modules/a.js"],
+)
+def test_compiled_patterns_match_like_fnmatch(rel_path: str) -> None:
+    """
+    Test that the compiled pattern regex agrees with matching each pattern through `fnmatch`.
+
+    Given a set of include/ignore patterns:
+    When a relative path is matched against the compiled expression,
+    Then it should match exactly when at least one pattern matches it through `fnmatch`.
+    """
+    patterns = {"*.py", "src/*", "**/subdir/**", ".git", "node_modules", "", "dir?/*.txt"}
+
+    expected = any(fnmatch(rel_path, pattern) for pattern in patterns if pattern)
+
+    assert (_compile_patterns(frozenset(patterns)).match(rel_path) is not None) == expected
+
+
+def test_compiled_patterns_empty_set_matches_nothing() -> None:
+    """
+    Test that compiling an empty set of patterns yields an expression that never matches.
+    """
+    assert _compile_patterns(frozenset()).match("") is None
+    assert _compile_patterns(frozenset({""})).match("file1.txt") is None
+
+
+def test_ingest_query_summary_only(temp_directory: Path, sample_query: IngestionQuery) -> None:
+    """
+    Test `ingest_query` with `summary_only=True`.
+
+    Given a directory with .txt and .py files:
+    When `ingest_query` is invoked with `summary_only=True`,
+    Then it should count the files and estimate the tokens from their sizes, and return an empty tree and content.
+    """
+    sample_query.local_path = temp_directory
+    sample_query.subpath = "/"
+    sample_query.type = None
+
+    summary, tree, content = ingest_query(sample_query, summary_only=True)
+
+    assert "Repository: test_user/test_repo" in summary
+    assert "Files analyzed: 8" in summary
+    total_size = sum(path.stat().st_size for path in temp_directory.rglob("*") if path.is_file())
+    assert f"Estimated tokens: {total_size // BYTES_PER_TOKEN}" in summary
+    assert tree == ""
+    assert content == ""
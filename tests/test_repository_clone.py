@@ -7,14 +7,24 @@ and handling edge cases such as nonexistent URLs, timeouts, redirects, and speci
 
 import asyncio
 import os
+import shutil
+import subprocess
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from typing import Tuple
+from unittest.mock import AsyncMock, call, patch
 
 import pytest
 
-from gitingest.cloning import check_repo_exists, clone_repo
+from gitingest.cloning import (
+    check_repo_exists,
+    checkout_from_mirror,
+    clone_repo,
+    prune_mirrors,
+    remove_mirror_worktree,
+)
 from gitingest.schemas import CloneConfig
 from gitingest.utils.exceptions import AsyncTimeoutError
+from gitingest.utils.git_utils import fetch_remote_commit_sha, run_command
 
 
 @pytest.mark.asyncio
@@ -218,7 +228,15 @@ async def test_clone_commit_without_branch() -> None:
             await clone_repo(clone_config)
 
             assert mock_exec.call_count == 2  # Clone and checkout calls
-            mock_exec.assert_any_call("git", "clone", "--single-branch", clone_config.url, clone_config.local_path)
+            mock_exec.assert_any_call(
+                "git",
+                "clone",
+                "--single-branch",
+                "--filter=blob:none",
+                "--no-checkout",
+                clone_config.url,
+                clone_config.local_path,
+            )
             mock_exec.assert_any_call("git", "-C", clone_config.local_path, "checkout", clone_config.commit)
 
 
@@ -448,3 +466,197 @@ async def test_clone_with_commit_and_subpath() -> None:
             )
 
             assert mock_exec.call_count == 2
+
+
+@pytest.fixture
+def source_repo(tmp_path: Path) -> Tuple[str, str, str]:
+    """
+    Create a local repository with two commits on `main`, to be used as a remote.
+
+    Returns
+    -------
+    Tuple[str, str, str]
+        The `file://` URL of the repository, and the SHAs of its first and second commits.
+    """
+    repo = tmp_path / "source"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "file.txt").write_text("one\n")
+    _git(repo, "add", "file.txt")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "one")
+    first_sha = _git(repo, "rev-parse", "HEAD")
+    (repo / "file.txt").write_text("two\n")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-am", "two")
+    second_sha = _git(repo, "rev-parse", "HEAD")
+    return repo.as_uri(), first_sha, second_sha
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.mark.asyncio
+async def test_checkout_from_mirror_creates_mirror(tmp_path: Path, source_repo: Tuple[str, str, str]) -> None:
+    """
+    Test checking out a branch through a mirror that does not exist yet.
+
+    Given a valid URL, a branch and a mirror path that does not exist:
+    When `checkout_from_mirror` is called,
+    Then a bare mirror with an `origin` remote should be created and the branch tip checked out as a detached
+    worktree, without leaving temporary refs or directories behind.
+    """
+    url, _, second_sha = source_repo
+    mirror_path = tmp_path / "mirrors" / "repo.git"
+    clone_config = CloneConfig(url=url, local_path=str(tmp_path / "checkout" / "repo"), branch="main")
+
+    with patch("gitingest.cloning.check_repo_exists", return_value=True):
+        await checkout_from_mirror(clone_config, mirror_path)
+
+    assert _git(mirror_path, "remote", "get-url", "origin") == url
+    assert _git(Path(clone_config.local_path), "rev-parse", "HEAD") == second_sha
+    assert (Path(clone_config.local_path) / "file.txt").read_text() == "two\n"
+    assert _git(mirror_path, "for-each-ref", "refs/gitingest") == ""
+    assert [path.name for path in mirror_path.parent.iterdir()] == ["repo.git"]
+
+
+@pytest.mark.asyncio
+async def test_checkout_from_existing_mirror(tmp_path: Path, source_repo: Tuple[str, str, str]) -> None:
+    """
+    Test checking out a commit through a mirror that already exists.
+
+    Given a mirror created by an earlier checkout and a commit that is no longer the branch tip:
+    When `checkout_from_mirror` is called with that commit,
+    Then exactly that commit should be checked out, not the current tip of the branch.
+    """
+    url, first_sha, _ = source_repo
+    mirror_path = tmp_path / "mirrors" / "repo.git"
+
+    with patch("gitingest.cloning.check_repo_exists", return_value=True):
+        await checkout_from_mirror(CloneConfig(url=url, local_path=str(tmp_path / "a" / "repo")), mirror_path)
+
+        clone_config = CloneConfig(url=url, local_path=str(tmp_path / "b" / "repo"), branch="main", commit=first_sha)
+        await checkout_from_mirror(clone_config, mirror_path)
+
+    assert _git(Path(clone_config.local_path), "rev-parse", "HEAD") == first_sha
+    assert (Path(clone_config.local_path) / "file.txt").read_text() == "one\n"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_mirror_creation_is_not_reused(tmp_path: Path, source_repo: Tuple[str, str, str]) -> None:
+    """
+    Test that a mirror whose creation failed half-way does not break later checkouts.
+
+    Given a first checkout that fails right after `git init --bare`:
+    When `checkout_from_mirror` is called again,
+    Then no broken mirror should have been left behind and the second checkout should succeed.
+    """
+    url, _, second_sha = source_repo
+    mirror_path = tmp_path / "mirrors" / "repo.git"
+    clone_config = CloneConfig(url=url, local_path=str(tmp_path / "checkout" / "repo"))
+
+    async def fail_after_init(*args: str) -> Tuple[bytes, bytes]:
+        if "remote" in args:
+            raise RuntimeError("Interrupted")
+        return await run_command(*args)
+
+    with patch("gitingest.cloning.check_repo_exists", return_value=True):
+        with patch("gitingest.cloning.run_command", side_effect=fail_after_init):
+            with pytest.raises(RuntimeError, match="Interrupted"):
+                await checkout_from_mirror(clone_config, mirror_path)
+
+        assert not mirror_path.parent.exists() or not any(mirror_path.parent.iterdir())
+
+        await checkout_from_mirror(clone_config, mirror_path)
+
+    assert _git(Path(clone_config.local_path), "rev-parse", "HEAD") == second_sha
+
+
+@pytest.mark.asyncio
+async def test_prune_mirrors(tmp_path: Path, source_repo: Tuple[str, str, str]) -> None:
+    """
+    Test pruning idle mirrors.
+
+    Given an idle mirror whose worktree directory was deleted, and an idle mirror with a live worktree:
+    When `prune_mirrors` is called,
+    Then the first mirror should be deleted and the second one kept.
+    """
+    url, _, _ = source_repo
+    mirrors_dir = tmp_path / "mirrors"
+    stale_checkout = tmp_path / "stale" / "repo"
+    live_checkout = tmp_path / "live" / "repo"
+
+    with patch("gitingest.cloning.check_repo_exists", return_value=True):
+        await checkout_from_mirror(CloneConfig(url=url, local_path=str(stale_checkout)), mirrors_dir / "stale.git")
+        await checkout_from_mirror(CloneConfig(url=url, local_path=str(live_checkout)), mirrors_dir / "live.git")
+    shutil.rmtree(stale_checkout)
+
+    await prune_mirrors(mirrors_dir, max_idle=-1)
+
+    assert not (mirrors_dir / "stale.git").exists()
+    assert (mirrors_dir / "live.git").exists()
+    assert _git(live_checkout, "rev-parse", "HEAD")
+
+
+@pytest.mark.asyncio
+async def test_checkout_from_mirror_nonexistent_repository(tmp_path: Path) -> None:
+    """
+    Test checking out a nonexistent repository through a mirror.
+
+    Given an invalid repository URL:
+    When `checkout_from_mirror` is called,
+    Then a ValueError should be raised and no mirror should be created.
+    """
+    clone_config = CloneConfig(
+        url="https://github.com/user/nonexistent-repo",
+        local_path=str(tmp_path / "checkout" / "repo"),
+    )
+
+    with patch("gitingest.cloning.check_repo_exists", return_value=False):
+        with patch("gitingest.cloning.run_command", new_callable=AsyncMock) as mock_exec:
+            with pytest.raises(ValueError, match="Repository not found"):
+                await checkout_from_mirror(clone_config, tmp_path / "mirror.git")
+
+            mock_exec.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_remove_mirror_worktree(tmp_path: Path) -> None:
+    """
+    Test removing a worktree created from a mirror.
+    """
+    mirror_path = tmp_path / "mirror.git"
+
+    with patch("gitingest.cloning.run_command", new_callable=AsyncMock) as mock_exec:
+        await remove_mirror_worktree("/tmp/repo", mirror_path)
+
+        mock_exec.assert_called_once_with("git", "-C", str(mirror_path), "worktree", "remove", "--force", "/tmp/repo")
+
+
+@pytest.mark.asyncio
+async def test_fetch_remote_commit_sha_matches_exact_ref(tmp_path: Path) -> None:
+    """
+    Test that a ref is resolved to the exact branch, not another ref sharing its suffix.
+
+    Given a repository with branches `a/master` and `master` pointing to different commits:
+    When `fetch_remote_commit_sha` is called for `master` (and for `HEAD`),
+    Then the SHA of `refs/heads/master` should be returned even though `ls-remote` lists `a/master` first.
+    """
+    repo = tmp_path / "repo"
+
+    def git(*args: str) -> str:
+        return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout
+
+    repo.mkdir()
+    git("init", "-q", "-b", "master")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "one")
+    git("branch", "a/master")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "two")
+    master_sha = git("rev-parse", "master").strip()
+    assert git("rev-parse", "a/master").strip() != master_sha
+
+    url = repo.as_uri()
+    assert await fetch_remote_commit_sha(url, "master") == master_sha
+    assert await fetch_remote_commit_sha(url, "HEAD") == master_sha
+
+    with pytest.raises(RuntimeError):
+        await fetch_remote_commit_sha(url, "missing")